@@ -0,0 +1,188 @@
+"""A local stand-in for the PythonAnywhere API, for load tests."""
+
+import json
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from ssl import PROTOCOL_TLS_SERVER, SSLContext
+from urllib.parse import parse_qs, unquote, urlparse
+
+ROUTE = re.compile(r"^/api/v[01]/user/(?P<username>[^/]+)/(?P<flavor>[a-z_]+)/(?P<rest>.*)$")
+
+
+def _certificate(directory: Path) -> tuple[Path, Path]:
+    """Create a self-signed certificate for localhost in `directory`."""
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            "-keyout", str(key), "-out", str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+class FakeAPI:
+    """
+    Serve the parts of the PythonAnywhere API the tools use, over HTTPS on localhost.
+
+    Files live in memory, seeded with `files` (absolute path to bytes).  Every
+    request is delayed by `latency` seconds to mimic the network.  Point the
+    server at it with the environment from :meth:`environment`.
+    """
+
+    def __init__(self, username: str, files: dict[str, bytes] | None = None, latency: float = 0.0):
+        self.username = username
+        self.files = dict(files or {})
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._directory = tempfile.TemporaryDirectory()
+        self.ca_file, key = _certificate(Path(self._directory.name))
+
+        handler = type("Handler", (_Handler,), {"api": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        context = SSLContext(PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.ca_file, key)
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-api", daemon=True)
+
+    @property
+    def site(self) -> str:
+        return f"localhost:{self._server.server_address[1]}"
+
+    def environment(self) -> dict[str, str]:
+        """Return the environment variables that make the MCP server use this API."""
+        return {
+            "API_TOKEN": "load-test",
+            "PYTHONANYWHERE_USERNAME": self.username,
+            "PYTHONANYWHERE_SITE": self.site,
+            "REQUESTS_CA_BUNDLE": str(self.ca_file),
+        }
+
+    def __enter__(self) -> "FakeAPI":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._directory.cleanup()
+
+    def listing(self, directory: str) -> list[str]:
+        """Return the paths below `directory`, with directories ending in "/"."""
+        prefix = directory.rstrip("/") + "/"
+        entries = set()
+        with self.lock:
+            for path in self.files:
+                if path.startswith(prefix):
+                    parts = path[len(prefix):].split("/")
+                    entries.update(prefix + "/".join(parts[:depth]) + "/" for depth in range(1, len(parts)))
+                    entries.add(path)
+        return sorted(entries)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    api: FakeAPI
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes | object = b"", content_type: str = "application/json") -> None:
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _route(self) -> tuple[str, str, dict] | None:
+        url = urlparse(self.path)
+        match = ROUTE.match(url.path)
+        if not match or match["username"] != self.api.username:
+            self._send(404, {"detail": "Not found."})
+            return None
+        if self.headers.get("Authorization") != "Token load-test":
+            self._send(401, {"detail": "Invalid token."})
+            return None
+        with self.api.lock:
+            self.api.requests += 1
+        time.sleep(self.api.latency)
+        return match["flavor"], unquote(match["rest"]), parse_qs(url.query)
+
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return
+        flavor, rest, query = route
+        api = self.api
+        if flavor == "cpu":
+            self._send(200, {"daily_cpu_limit_seconds": 2000, "daily_cpu_total_usage_seconds": 0})
+        elif flavor == "files" and rest.startswith("path/"):
+            path = rest[len("path"):]
+            with api.lock:
+                content = api.files.get(path)
+            if content is not None:
+                self._send(200, content, "application/octet-stream")
+            elif listing := api.listing(path):
+                prefix = path.rstrip("/") + "/"
+                children = {entry[len(prefix):].split("/")[0] for entry in listing}
+                self._send(200, {
+                    name: {"type": "file" if prefix + name in api.files else "directory", "url": ""}
+                    for name in sorted(children)
+                })
+            else:
+                self._send(404, {"detail": "No such file or directory"})
+        elif flavor == "files" and rest == "tree/":
+            self._send(200, api.listing(query.get("path", ["/"])[0])[:1000])
+        elif flavor in ("webapps", "websites", "schedule") and rest == "":
+            self._send(200, [])
+        else:
+            self._send(404, {"detail": "Not found."})
+
+    def do_POST(self):
+        route = self._route()
+        if route is None:
+            return
+        flavor, rest, _ = route
+        body = self._body()
+        if flavor == "files" and rest.startswith("path/"):
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+            )
+            content = next(message.iter_parts()).get_payload(decode=True)
+            with self.api.lock:
+                existed = rest[len("path"):] in self.api.files
+                self.api.files[rest[len("path"):]] = content
+            self._send(200 if existed else 201)
+        elif flavor == "webapps" and rest.endswith("/reload/"):
+            self._send(200, {"status": "OK"})
+        else:
+            self._send(404, {"detail": "Not found."})
+
+    def do_DELETE(self):
+        route = self._route()
+        if route is None:
+            return
+        flavor, rest, _ = route
+        if flavor == "files" and rest.startswith("path/"):
+            with self.api.lock:
+                removed = self.api.files.pop(rest[len("path"):], None)
+            self._send(204 if removed is not None else 404)
+        else:
+            self._send(404, {"detail": "Not found."})
@@ -0,0 +1,259 @@
+"""
+Load and soak test for the MCP server.
+
+Starts the real entry point against a local fake PythonAnywhere API, drives
+concurrent MCP clients through a realistic mix of tools, and reports latency
+percentiles, throughput, error rate and the server's memory and file
+descriptor growth over the run::
+
+    python benchmarks/load.py --clients 20 --duration 600 --transport both --output soak.json
+
+Over stdio every client has its own server process, as MCP clients do; over
+streamable HTTP all clients share one server.  Memory and file descriptors
+are read from /proc, so they are only reported on Linux.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_api import FakeAPI  # noqa: E402
+
+USERNAME = "loadtest"
+HOME = f"/home/{USERNAME}"
+
+# Seed files: a small project tree, with one larger file.
+SEED_FILES = {
+    f"{HOME}/project/app/module_{index}.py": f"def handler_{index}():\n    return {index}\n".encode() * 20
+    for index in range(50)
+} | {f"{HOME}/project/README.md": b"# Project\n" * 2000}
+
+# (weight, tool name, arguments) of the calls each client makes.
+TOOL_MIX = [
+    (40, "read_file_or_directory", lambda client, n: {"path": f"{HOME}/project/app/module_{n % 50}.py"}),
+    (15, "tree", lambda client, n: {"path": f"{HOME}/project/"}),
+    (15, "upload_text_file", lambda client, n: {"dest_path": f"{HOME}/scratch/{client}/{n % 20}.txt", "content": f"{n}\n" * 200}),
+    (10, "search_files", lambda client, n: {"root": f"{HOME}/project/app/", "regex": f"return {n % 50}$"}),
+    (10, "list_webapps", lambda client, n: {}),
+    (5, "list_scheduled_tasks", lambda client, n: {}),
+    (5, "list_websites", lambda client, n: {}),
+]
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _summary(latencies: list[float]) -> dict:
+    return {
+        "count": len(latencies),
+        "p50_ms": round(_percentile(latencies, 0.5) * 1000, 1) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+    }
+
+
+def _children() -> list[int]:
+    """Return the ids of this process's child processes, which are the servers under test."""
+    pids = []
+    for entry in Path("/proc").glob("[0-9]*"):
+        try:
+            ppid = int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == os.getpid():
+            pids.append(int(entry.name))
+    return pids
+
+
+def _resources(pids: list[int]) -> dict:
+    """Return the total resident memory (KiB) and open file descriptors of `pids`."""
+    rss = fds = 0
+    for pid in pids:
+        try:
+            status = Path(f"/proc/{pid}/status").read_text()
+            rss += int(next(line for line in status.splitlines() if line.startswith("VmRSS:")).split()[1])
+            fds += len(os.listdir(f"/proc/{pid}/fd"))
+        except (OSError, StopIteration):
+            continue
+    return {"processes": len(pids), "rss_kib": rss, "open_fds": fds}
+
+
+class Recorder:
+    """Collect per-call outcomes and periodic resource samples."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.samples: list[dict] = []
+        self.started = time.monotonic()
+
+    def record(self, tool: str, seconds: float, error: str | None) -> None:
+        self.latencies.setdefault(tool, []).append(seconds)
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def sample(self) -> None:
+        calls = sum(len(values) for values in self.latencies.values())
+        self.samples.append({"elapsed_s": round(time.monotonic() - self.started, 1), "calls": calls} | _resources(_children()))
+
+    def report(self, transport: str, clients: int) -> dict:
+        elapsed = time.monotonic() - self.started
+        everything = [value for values in self.latencies.values() for value in values]
+        errors = sum(self.errors.values())
+        # Growth is measured from the first sample after calls began, so
+        # connection pools filling up at startup do not count as leaks.
+        warm = [sample for sample in self.samples if sample["calls"]] or self.samples or [{}]
+        first, last = warm[0], warm[-1]
+        return {
+            "transport": transport,
+            "clients": clients,
+            "duration_s": round(elapsed, 1),
+            "calls": len(everything),
+            "throughput_per_s": round(len(everything) / elapsed, 1),
+            "error_rate": round(errors / max(1, len(everything)), 4),
+            "errors": self.errors,
+            "latency": _summary(everything),
+            "latency_by_tool": {tool: _summary(values) for tool, values in sorted(self.latencies.items())},
+            "rss_growth_kib": last.get("rss_kib", 0) - first.get("rss_kib", 0),
+            "fd_growth": last.get("open_fds", 0) - first.get("open_fds", 0),
+            "samples": self.samples,
+        }
+
+
+async def _drive(session: ClientSession, client: int, deadline: float, recorder: Recorder) -> None:
+    weights = [weight for weight, _, _ in TOOL_MIX]
+    n = 0
+    while time.monotonic() < deadline:
+        _, tool, arguments = random.choices(TOOL_MIX, weights)[0]
+        started = time.monotonic()
+        error = None
+        try:
+            result = await session.call_tool(tool, arguments(client, n))
+            if result.isError:
+                error = f"{tool}: {result.content[0].text[:120] if result.content else 'error'}"
+        except Exception as exc:
+            error = f"{tool}: {type(exc).__name__}: {exc}"
+        recorder.record(tool, time.monotonic() - started, error)
+        n += 1
+
+
+async def _sampler(recorder: Recorder, interval: float, deadline: float) -> None:
+    while time.monotonic() < deadline:
+        recorder.sample()
+        await anyio.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+    recorder.sample()
+
+
+async def run_stdio(environment: dict, clients: int, duration: float, interval: float) -> dict:
+    recorder = Recorder()
+    parameters = StdioServerParameters(
+        command=sys.executable, args=["-m", "pythonanywhere_mcp_server"], env=os.environ | environment,
+    )
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(clients):
+            read, write = await stack.enter_async_context(stdio_client(parameters, errlog=subprocess.DEVNULL))
+            sessions.append(await stack.enter_async_context(ClientSession(read, write)))
+            await sessions[-1].initialize()
+        recorder.started = time.monotonic()
+        deadline = recorder.started + duration
+        async with anyio.create_task_group() as group:
+            group.start_soon(_sampler, recorder, interval, deadline)
+            for client, session in enumerate(sessions):
+                group.start_soon(_drive, session, client, deadline, recorder)
+    return recorder.report("stdio", clients)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_http(environment: dict, clients: int, duration: float, interval: float) -> dict:
+    recorder = Recorder()
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "pythonanywhere_mcp_server", "--transport", "streamable-http", "--port", str(port)],
+        env=os.environ | environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                await anyio.sleep(0.1)
+        async with AsyncExitStack() as stack:
+            sessions = []
+            for _ in range(clients):
+                read, write, _ = await stack.enter_async_context(streamablehttp_client(f"http://127.0.0.1:{port}/mcp"))
+                sessions.append(await stack.enter_async_context(ClientSession(read, write)))
+                await sessions[-1].initialize()
+            await sessions[-1].initialize()
+            recorder.started = time.monotonic()
+            deadline = recorder.started + duration
+            async with anyio.create_task_group() as group:
+                group.start_soon(_sampler, recorder, interval, deadline)
+                for client, session in enumerate(sessions):
+                    group.start_soon(_drive, session, client, deadline, recorder)
+    finally:
+        server.terminate()
+        server.wait()
+    return recorder.report("streamable-http", clients)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent MCP clients (default: 10).")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run each transport for (default: 60).")
+    parser.add_argument("--transport", choices=["stdio", "http", "both"], default="both")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to each fake API response (default: 0.02).")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between resource samples (default: 5).")
+    parser.add_argument("--output", help="Write the full report, with samples, to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    reports = []
+    with FakeAPI(USERNAME, SEED_FILES, args.latency) as api:
+        environment = api.environment()
+        if args.transport in ("stdio", "both"):
+            reports.append(anyio.run(run_stdio, environment, args.clients, args.duration, args.interval))
+        if args.transport in ("http", "both"):
+            reports.append(anyio.run(run_http, environment, args.clients, args.duration, args.interval))
+        upstream = api.requests
+    for report in reports:
+        print(
+            f"{report['transport']}: {report['calls']} calls from {report['clients']} clients in {report['duration_s']}s, "
+            f"{report['throughput_per_s']}/s, p50 {report['latency']['p50_ms']} ms, p99 {report['latency']['p99_ms']} ms, "
+            f"errors {report['error_rate']:.2%}, RSS growth {report['rss_growth_kib']} KiB, fd growth {report['fd_growth']}"
+        )
+        for error, count in sorted(report["errors"].items(), key=lambda item: -item[1])[:5]:
+            print(f"  {count} x {error}")
+    print(f"Fake API served {upstream} requests.")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"reports": reports, "upstream_requests": upstream}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
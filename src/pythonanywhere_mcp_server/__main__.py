@@ -1,13 +1,74 @@
 """Entry point for the PythonAnywhere MCP server."""
 
+import argparse
+import os
 import sys
+from . import preflight
 from .server import create_server
+from .watch import DEBOUNCE, watch
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="pythonanywhere-mcp-server",
+        description="PythonAnywhere Model Context Protocol Server. Runs the server when no command is given.",
+    )
+    parser.add_argument(
+        "--transport", choices=["stdio", "streamable-http"], default="stdio",
+        help="Transport to serve MCP over (default: stdio).",
+    )
+    parser.add_argument("--host", help="Address to listen on with streamable-http (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, help="Port to listen on with streamable-http (default: 8000).")
+    parser.add_argument(
+        "--trace", metavar="PATH",
+        help="Append a JSONL trace of every tool call to PATH (or set PYTHONANYWHERE_TRACE).",
+    )
+    parser.add_argument(
+        "--profile-slow", type=float, metavar="SECONDS",
+        help="With --trace, save cProfile stats of tool calls taking at least SECONDS.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    watch_parser = commands.add_parser(
+        "watch",
+        help="Push changes in a local directory to PythonAnywhere as they happen.",
+    )
+    watch_parser.add_argument("local_dir", help="Local directory to watch.")
+    watch_parser.add_argument("remote_dir", help="Absolute path of the directory on PythonAnywhere.")
+    watch_parser.add_argument("--domain", help="Reload the webapp for this domain after each push.")
+    watch_parser.add_argument(
+        "--website", action="store_true",
+        help="Reload DOMAIN as an ASGI website instead of a uWSGI webapp.",
+    )
+    watch_parser.add_argument(
+        "--ignore", action="append", default=None, metavar="GLOB",
+        help="File or directory name to skip (repeatable); replaces the default list.",
+    )
+    watch_parser.add_argument(
+        "--debounce", type=float, default=DEBOUNCE,
+        help=f"Seconds without changes before a burst is pushed (default: {DEBOUNCE}).",
+    )
+    return parser.parse_args(argv)
 
 def main():
     """Main entry point for the MCP server."""
+    args = parse_args()
     try:
+        preflight.use_shared_session()
+        if args.command == "watch":
+            options = {"ignore": args.ignore} if args.ignore else {}
+            watch(args.local_dir, args.remote_dir, args.domain, args.website, debounce=args.debounce, **options)
+            return
+        if args.trace:
+            os.environ["PYTHONANYWHERE_TRACE"] = args.trace
+        if args.profile_slow is not None:
+            os.environ["PYTHONANYWHERE_PROFILE_SLOW"] = str(args.profile_slow)
         mcp = create_server()
-        mcp.run()
+        if args.host:
+            mcp.settings.host = args.host
+        if args.port:
+            mcp.settings.port = args.port
+        if os.getenv("PYTHONANYWHERE_PREFLIGHT", "1") != "0":
+            preflight.start()
+        mcp.run(args.transport)
     except KeyboardInterrupt:
         print("\nServer interrupted by user", file=sys.stderr)
         sys.exit(0)
@@ -16,4 +77,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
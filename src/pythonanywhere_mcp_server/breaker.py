@@ -0,0 +1,153 @@
+"""Per-endpoint circuit breakers and timeouts for PythonAnywhere API requests."""
+
+import functools
+import os
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlparse
+
+import requests
+
+# API endpoints with their own breaker, named by the path segment after /user/<username>/.
+ENDPOINTS = ("files", "webapps", "websites", "schedule")
+
+# Seconds to wait for a connection or for the next bytes of a response.
+# Override it with PYTHONANYWHERE_TIMEOUT, or per endpoint with e.g.
+# PYTHONANYWHERE_TIMEOUT_FILES.
+DEFAULT_TIMEOUT = 60.0
+
+# Consecutive failures (request errors and 5xx responses) that trip a breaker.
+FAILURE_THRESHOLD = 5
+
+# Seconds a tripped breaker fails fast before letting a probe request through.
+RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Track consecutive failures of one endpoint and stop calling it while it is down.
+
+    A closed breaker lets every request through.  After `threshold` consecutive
+    failures it opens, and requests fail at once with :class:`CircuitOpenError`.
+    Once `reset_timeout` seconds have passed it is half-open: a single probe
+    request goes through, closing the breaker if it succeeds and opening it
+    again if it fails.
+    """
+
+    def __init__(self, name: str, threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._trips = 0
+        self._rejected = 0
+        self._last_error = None
+
+    def before(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a request may be made now."""
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = "half-open"
+            if self._state == "closed" or (self._state == "half-open" and not self._probing):
+                self._probing = self._state == "half-open"
+                return
+            self._rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(
+                f"The PythonAnywhere {self.name} API is failing ({self._last_error}); "
+                f"not calling it again for {retry_in:.0f}s. See pythonanywhere://metrics for breaker state."
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, error: str) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            if self._state == "half-open" or self._failures >= self.threshold:
+                if self._state != "open":
+                    self._trips += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        """Let another probe through after one that ended without a verdict."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> dict:
+        """Return the state, failure count and number of trips and rejected requests."""
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "last_error": self._last_error,
+                "timeout_seconds": timeout_for(self.name),
+            }
+
+
+breakers = {name: CircuitBreaker(name) for name in ENDPOINTS}
+
+
+def endpoint_for(url: str) -> str | None:
+    """Return the name of the endpoint `url` belongs to, or None if it has no breaker."""
+    parts = urlparse(url).path.strip("/").split("/")
+    # /api/v0/user/<username>/<endpoint>/...
+    if len(parts) > 4 and parts[2] == "user" and parts[4] in ENDPOINTS:
+        return parts[4]
+    return None
+
+
+def timeout_for(endpoint: str | None) -> float:
+    """Return the request timeout configured for `endpoint`."""
+    value = (endpoint and os.getenv(f"PYTHONANYWHERE_TIMEOUT_{endpoint.upper()}")) or os.getenv("PYTHONANYWHERE_TIMEOUT")
+    return float(value) if value else DEFAULT_TIMEOUT
+
+
+def guard(request: Callable[..., requests.Response]) -> Callable[..., requests.Response]:
+    """
+    Wrap a `requests.request`-like function with a timeout and the breaker of each endpoint.
+
+    Request errors, such as connection errors and timeouts, and 5xx responses
+    count as failures; any other response, including 4xx errors, shows the
+    endpoint is up.
+    """
+    @functools.wraps(request)
+    def guarded(method: str, url: str, **kwargs) -> requests.Response:
+        endpoint = endpoint_for(url)
+        kwargs.setdefault("timeout", timeout_for(endpoint))
+        breaker = breakers.get(endpoint)
+        if breaker is None:
+            return request(method, url, **kwargs)
+        breaker.before()
+        try:
+            response = request(method, url, **kwargs)
+        except requests.RequestException as exc:
+            breaker.record_failure(type(exc).__name__)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            breaker.record_success()
+        return response
+
+    return guarded
@@ -0,0 +1,154 @@
+"""Bound the size of tool results sent to the client."""
+
+import functools
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import pydantic_core
+from mcp.server.fastmcp import FastMCP
+from mcp.types import TextContent
+
+from pythonanywhere_mcp_server.tool_hooks import wrap_result, wrap_tools
+
+# Maximum size of a tool result, in bytes as sent to the client.  Override it
+# with PYTHONANYWHERE_RESPONSE_BUDGET, or per tool with e.g.
+# PYTHONANYWHERE_RESPONSE_BUDGET_TREE; 0 disables the limit.
+DEFAULT_BUDGET = 100_000
+
+# Bytes of a cut result set aside for the truncation note and the envelope
+# around the content.
+NOTE_ALLOWANCE = 1_000
+
+# Number, and total size in bytes of JSON, of the oversized results kept for
+# `continue_result`; the oldest are dropped first.
+MAX_STORED_RESULTS = 32
+MAX_STORED_BYTES = 64 * 1024 * 1024
+
+_stored: OrderedDict[str, tuple[Any, int, int]] = OrderedDict()
+_stored_bytes = 0
+_stored_lock = threading.Lock()
+
+
+def budget_for(tool_name: str) -> int:
+    """Return the response budget configured for `tool_name`."""
+    value = os.getenv(f"PYTHONANYWHERE_RESPONSE_BUDGET_{tool_name.upper()}") or os.getenv("PYTHONANYWHERE_RESPONSE_BUDGET")
+    return int(value) if value else DEFAULT_BUDGET
+
+
+def _store(result: Any, budget: int) -> str | None:
+    """Keep `result` for `continue_result` and return its handle, or None if it is too large to keep."""
+    global _stored_bytes
+    size = len(pydantic_core.to_json(result, fallback=str))
+    if size > MAX_STORED_BYTES:
+        return None
+    handle = uuid.uuid4().hex
+    with _stored_lock:
+        _stored[handle] = (result, budget, size)
+        _stored_bytes += size
+        while len(_stored) > MAX_STORED_RESULTS or _stored_bytes > MAX_STORED_BYTES:
+            _stored_bytes -= _stored.popitem(last=False)[1][2]
+    return handle
+
+
+def _sent_size(value: Any) -> int:
+    """
+    Return the bytes `value` takes in a tool result as FastMCP sends it.
+
+    A string, or each item of a list, is sent as a text content block, with
+    anything else as indented JSON, and again as structured content.
+    """
+    text = value if isinstance(value, str) else pydantic_core.to_json(value, fallback=str, indent=2).decode()
+    block = TextContent(type="text", text=text).model_dump_json(by_alias=True, exclude_none=True)
+    return len(block.encode()) + len(pydantic_core.to_json(value, fallback=str)) + 2
+
+
+def _continuation(handle: str | None, end: int) -> str:
+    if handle is None:
+        return "The rest is too large to keep; narrow the request to see more."
+    return f"Call `continue_result` with handle '{handle}' and offset {end} for more."
+
+
+def fit(result: Any, budget: int, offset: int = 0, handle: str | None = None) -> Any:
+    """
+    Return the part of `result` starting at `offset` that fits in `budget`.
+
+    Sizes are measured as the result is sent, both as text content and as
+    structured content.  Text is cut and lists keep as many items as fit,
+    always at least one character or item, with a note giving the counts and
+    a handle for `continue_result`.  Lists keep their item type: the note is a
+    string in lists of strings and a dictionary otherwise.  Other results, and
+    results within budget, are returned as they are.
+    """
+    if not budget or not isinstance(result, (str, list)):
+        return result
+    room = budget - NOTE_ALLOWANCE
+    if isinstance(result, str):
+        if _sent_size(result[offset:]) <= budget:
+            return result[offset:]
+        end = min(offset + max(room // 2, 1), len(result))
+        while end > offset + 1 and (size := _sent_size(result[offset:end])) > room:
+            end = offset + max(min(end - offset - 1, (end - offset) * room // size), 1)
+        handle = handle or _store(result, budget)
+        return result[offset:end] + (
+            f"\n\n[Truncated to the {budget}-byte response budget: showing characters "
+            f"{offset + 1}-{end} of {len(result)}. {_continuation(handle, end)}]"
+        )
+
+    end = cut = offset
+    used = 0
+    while end < len(result):
+        used += _sent_size(result[end])
+        if used > budget:
+            break
+        end += 1
+        if used <= room:
+            cut = end
+    else:
+        return result[offset:]
+    end = max(cut, offset + 1)
+    handle = handle or _store(result, budget)
+    note = (
+        f"Truncated to the {budget}-byte response budget: showing items {offset + 1}-{end} "
+        f"of {len(result)}. {_continuation(handle, end)}"
+    )
+    if all(isinstance(item, str) for item in result[offset:end]):
+        return result[offset:end] + [f"[{note}]"]
+    return result[offset:end] + [{
+        "truncated": True,
+        "total": len(result),
+        "returned": end - offset,
+        "next_offset": end,
+        "handle": handle,
+        "message": note,
+    }]
+
+
+def apply_response_budget(mcp: FastMCP) -> None:
+    """
+    Make tools registered with `mcp.tool()` return results cut to their response budget.
+
+    Also registers the `continue_result` tool for fetching the rest of a cut result.
+    """
+    @mcp.tool()
+    def continue_result(handle: str, offset: int) -> str | list:
+        """
+        Return the next part of a tool result that was truncated to fit the response budget.
+
+        Args:
+            handle (str): The handle given in the truncation note.
+            offset (int): The offset given in the truncation note.
+
+        Returns:
+            str | list: The next part of the result, with a further note if more remains.
+        """
+        with _stored_lock:
+            stored = _stored.get(handle)
+        if stored is None:
+            raise RuntimeError(f"No stored result for handle '{handle}'; it may have expired, call the original tool again.")
+        result, budget, _ = stored
+        return fit(result, budget, offset, handle)
+
+    wrap_tools(mcp, lambda name, fn: wrap_result(fn, functools.partial(fit, budget=budget_for(name))))
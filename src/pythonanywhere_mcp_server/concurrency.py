@@ -0,0 +1,100 @@
+import contextvars
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator
+
+from pythonanywhere_mcp_server.progress import Cancelled, Progress, cancelled
+from pythonanywhere_mcp_server.scheduler import current_flow
+
+# Upper bound on simultaneous API requests made by bulk operations.
+MAX_WORKERS = 8
+
+_batches = itertools.count(1)
+
+
+def iter_concurrently(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = MAX_WORKERS,
+    weight: Callable[[Any], int] | None = None,
+    max_weight: int | None = None,
+) -> Iterator[tuple[Any, Any]]:
+    """
+    Call `fn` on each of `items` using a pool of at most `max_workers` threads, yielding `(item, outcome)` as calls finish.
+
+    `items` is consumed lazily: the next item is only taken once fewer than
+    `max_workers` calls are running and, with `max_weight`, once the `weight`
+    of the items being worked on is below it.  A generator producing `items`
+    is therefore held back by the calls, and what it has produced but not yet
+    seen finish stays bounded.
+
+    The calls run in the caller's context, as one scheduler flow of their own
+    within the caller's.  Each outcome is either the value returned by `fn` or the exception it
+    raised, so one failure does not abort the whole batch.
+
+    If the client cancels the tool call, no more items are taken, calls not
+    yet started are dropped, and Cancelled is raised once the running ones end.
+    """
+    flow = f"{current_flow.get()}/batch-{next(_batches)}"
+
+    def call(item):
+        current_flow.set(flow)
+        return fn(item)
+
+    items = iter(items)
+    running = {}
+    load = 0
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while True:
+            if cancelled():
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise Cancelled("cancelled by the client")
+            while not exhausted and len(running) < max_workers and (max_weight is None or not running or load < max_weight):
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                item_weight = weight(item) if weight else 0
+                running[pool.submit(contextvars.copy_context().run, call, item)] = (item, item_weight)
+                load += item_weight
+            if not running:
+                return
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, item_weight = running.pop(future)
+                load -= item_weight
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    outcome = exc
+                yield item, outcome
+
+
+def run_concurrently(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = MAX_WORKERS,
+    progress: Progress | None = None,
+    message: str = "{done} of {total} done",
+) -> dict:
+    """
+    Call `fn` on each of `items` using a pool of at most `max_workers` threads.
+
+    The calls run in the caller's context, as one scheduler flow of their own
+    within the caller's.  Returns a dictionary mapping each item to either the value returned by `fn`
+    or the exception it raised, so one failure does not abort the whole batch.
+
+    With `progress`, how many calls have finished is reported as they finish,
+    described by `message` formatted with `done` and `total`.
+    """
+    if progress is None:
+        return dict(iter_concurrently(fn, items, max_workers))
+    items = list(dict.fromkeys(items))
+    outcomes = {}
+    for item, outcome in iter_concurrently(fn, items, max_workers):
+        outcomes[item] = outcome
+        done = len(outcomes)
+        progress.report(done, len(items), message.format(done=done, total=len(items)), force=done == len(items))
+    return outcomes
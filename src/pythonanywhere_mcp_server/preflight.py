@@ -0,0 +1,116 @@
+"""Check connectivity and credentials in the background when the server starts."""
+
+import socket
+import sys
+import threading
+import time
+import types
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import pythonanywhere_core.base
+import requests
+from requests.adapters import HTTPAdapter
+from pythonanywhere_core.base import AuthenticationError, call_api, get_api_endpoint, get_username
+
+from pythonanywhere_mcp_server.breaker import guard
+from pythonanywhere_mcp_server.scheduler import Priority, call, scheduler
+from pythonanywhere_mcp_server.tracing import traced_request
+
+_status = {"state": "not started"}
+_status_lock = threading.Lock()
+
+
+class _SessionRequests(types.ModuleType):
+    """
+    The `requests` module as seen from `pythonanywhere_core.base`.
+
+    Only `request` differs: it goes through a session, with timeouts, circuit
+    breakers and tracing.  Everything else is looked up on `requests` itself,
+    which is left untouched for the rest of the process.
+    """
+
+    def __init__(self, session: requests.Session):
+        super().__init__(requests.__name__, requests.__doc__)
+        self.request = traced_request(guard(session.request))
+
+    def __getattr__(self, name: str):
+        return getattr(requests, name)
+
+
+def use_shared_session(pool_size: int | None = None) -> requests.Session:
+    """
+    Send all `pythonanywhere_core` API calls through one pooled `requests.Session`.
+
+    `pythonanywhere_core` calls `requests.request`, which opens a new connection,
+    with a fresh DNS lookup and TLS handshake, for every API call.  A shared
+    session keeps up to `pool_size` connections (by default the scheduler's
+    concurrency limit) open for reuse.
+    """
+    pool_size = pool_size or scheduler.max_concurrent
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    pythonanywhere_core.base.requests = _SessionRequests(session)
+    return session
+
+
+def check() -> dict:
+    """
+    Resolve the configured site and validate the API token with one cheap API call.
+
+    With a shared session, the connection made here stays open for the first
+    tool call.  Returns the result, which is also kept for :func:`status`.
+    """
+    username = get_username()
+    url = get_api_endpoint(username=username, flavor="cpu")
+    host = urlparse(url).hostname
+    result = {"state": "checking", "site": host, "username": username}
+    with _status_lock:
+        _status.clear()
+        _status.update(result)
+
+    started = time.monotonic()
+    try:
+        socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+        result["dns_ms"] = round((time.monotonic() - started) * 1000, 1)
+        response = call(Priority.INTERACTIVE, call_api, url, "GET")
+        result["api_ms"] = round((time.monotonic() - started) * 1000 - result["dns_ms"], 1)
+        if response.ok:
+            result["state"] = "ok"
+        else:
+            result["state"] = "failed"
+            result["error"] = (
+                f"API returned HTTP {response.status_code} for user '{username}' on {host}; "
+                "check PYTHONANYWHERE_USERNAME and PYTHONANYWHERE_SITE."
+            )
+    except socket.gaierror as exc:
+        result["state"] = "failed"
+        result["error"] = f"Cannot resolve {host}: {exc}; check PYTHONANYWHERE_SITE."
+    except AuthenticationError:
+        result["state"] = "failed"
+        result["error"] = f"API token rejected by {host}; check API_TOKEN and PYTHONANYWHERE_SITE."
+    except Exception as exc:
+        result["state"] = "failed"
+        result["error"] = f"Cannot reach {host}: {exc}"
+    result["checked_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    with _status_lock:
+        _status.clear()
+        _status.update(result)
+    if result["state"] == "failed":
+        print(f"Preflight check failed: {result['error']}", file=sys.stderr)
+    return result
+
+
+def start() -> threading.Thread:
+    """Run :func:`check` in a background thread."""
+    thread = threading.Thread(target=check, name="preflight", daemon=True)
+    thread.start()
+    return thread
+
+
+def status() -> dict:
+    """Return the result of the latest preflight check."""
+    with _status_lock:
+        return dict(_status)
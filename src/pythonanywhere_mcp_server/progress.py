@@ -0,0 +1,66 @@
+"""Progress notifications from, and cancellation of, long-running tools."""
+
+import threading
+import time
+from contextvars import ContextVar
+
+import anyio.from_thread
+from mcp.server.fastmcp import Context
+
+# Minimum seconds between progress notifications for one tool call.
+PROGRESS_INTERVAL = 0.5
+
+# Set, in the threads working on a tool call, once the client cancels it.
+current_cancel: ContextVar[threading.Event | None] = ContextVar("current_cancel", default=None)
+
+
+class Cancelled(Exception):
+    """Raised by a tool that stopped because the client cancelled the call."""
+
+
+def cancelled() -> bool:
+    """Return whether the client has cancelled the tool call being worked on."""
+    event = current_cancel.get()
+    return event is not None and event.is_set()
+
+
+def check_cancelled() -> None:
+    """Raise Cancelled if the client has cancelled the tool call being worked on."""
+    if cancelled():
+        raise Cancelled("cancelled by the client")
+
+
+class Progress:
+    """
+    Send MCP progress notifications for a tool running in a worker thread.
+
+    Nothing is sent when there is no context, as when a tool is called
+    directly, or when the client did not ask for progress with a progress
+    token, or once it has cancelled the call.  Notifications are sent at most
+    every `interval` seconds, unless forced, as the last one of a call should be.
+    """
+
+    def __init__(self, ctx: Context | None, interval: float = PROGRESS_INTERVAL):
+        self.ctx = ctx
+        self.interval = interval
+        self._sent = None
+        try:
+            meta = ctx.request_context.meta if ctx is not None else None
+        except ValueError:
+            # Called outside a request.
+            meta = None
+        self.enabled = meta is not None and meta.progressToken is not None
+
+    def report(self, progress: float, total: float | None = None, message: str | None = None, force: bool = False) -> None:
+        """
+        Report `progress` out of `total` (if known), with a human-readable `message`.
+
+        With `force`, the notification is sent however recently the last one was.
+        """
+        if not self.enabled or cancelled():
+            return
+        now = time.monotonic()
+        if not force and self._sent is not None and now - self._sent < self.interval:
+            return
+        self._sent = now
+        anyio.from_thread.run(self.ctx.report_progress, progress, total, message)
@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import json
+from urllib.parse import quote, unquote
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from pydantic import AnyUrl
+
+from pythonanywhere_core.base import call_api
+from pythonanywhere_core.files import Files
+
+from pythonanywhere_mcp_server.scheduler import Priority, call
+
+URI_PREFIX = "pythonanywhere://files/"
+
+# Seconds between checks of subscribed paths.
+POLL_INTERVAL = 10.0
+
+
+def file_uri(path: str) -> str:
+    """Return the resource URI for an absolute PythonAnywhere path."""
+    return URI_PREFIX + quote(path, safe="")
+
+
+def path_from_uri(uri: str) -> str:
+    """Return the absolute PythonAnywhere path addressed by a resource URI."""
+    if not uri.startswith(URI_PREFIX):
+        raise ValueError(f"Not a PythonAnywhere file URI: {uri}")
+    return unquote(uri[len(URI_PREFIX):])
+
+
+def fingerprint(path: str) -> str:
+    """
+    Return a token that changes whenever the file or directory at `path` changes.
+
+    Files are checked with a HEAD request and fingerprinted by their validators
+    and size, so their contents are never downloaded; a file the server sends
+    no ETag or Last-Modified for is only seen to change when its size does.
+    Directory listings are fetched and hashed.
+    """
+    url = f"{Files.path_endpoint}{path}"
+    # Without compression Content-Length is the size of the file itself.
+    response = call_api(url, "HEAD", headers={"Accept-Encoding": "identity"})
+    if response.status_code != 200:
+        return f"HTTP {response.status_code}"
+    headers = response.headers
+    if "application/json" not in headers.get("content-type", ""):
+        return json.dumps([headers.get(name) for name in ("ETag", "Last-Modified", "Content-Length")])
+    response = call_api(url, "GET")
+    if response.status_code != 200:
+        return f"HTTP {response.status_code}"
+    return hashlib.sha256(response.content).hexdigest()
+
+
+class FileWatcher:
+    """Poll subscribed PythonAnywhere paths and notify subscribers when they change."""
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self._subscribers: dict[str, set] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+
+    async def subscribe(self, uri: str, session) -> None:
+        path = path_from_uri(uri)
+        if uri not in self._fingerprints:
+            self._fingerprints[uri] = await anyio.to_thread.run_sync(call, Priority.INTERACTIVE, fingerprint, path)
+        self._subscribers.setdefault(uri, set()).add(session)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def unsubscribe(self, uri: str, session) -> None:
+        sessions = self._subscribers.get(uri, set())
+        sessions.discard(session)
+        if not sessions:
+            self._subscribers.pop(uri, None)
+            self._fingerprints.pop(uri, None)
+
+    async def check(self) -> None:
+        """Fingerprint every subscribed path once and notify subscribers of those that changed."""
+        for uri in list(self._subscribers):
+            try:
+                current = await anyio.to_thread.run_sync(call, Priority.BULK, fingerprint, path_from_uri(uri))
+            except Exception:
+                # Transient API errors are retried on the next check.
+                continue
+            if current == self._fingerprints.get(uri):
+                continue
+            self._fingerprints[uri] = current
+            for session in list(self._subscribers.get(uri, ())):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception:
+                    # The client went away; forget its subscription.
+                    await self.unsubscribe(uri, session)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+
+def register_file_resources(mcp: FastMCP) -> None:
+    @mcp.resource(
+        URI_PREFIX + "{path}",
+        name="pythonanywhere_file",
+        description=(
+            "A file or directory on PythonAnywhere.  `path` is the absolute path with "
+            "'/' percent-encoded as '%2F' (e.g. pythonanywhere://files/%2Fhome%2Falice%2Fapp.py).  "
+            "Files are returned as text, or as binary if they are not valid UTF-8; directories "
+            "as a JSON listing.  Supports subscriptions: an update notification is sent when "
+            "the file or directory changes."
+        ),
+    )
+    def read_file_resource(path: str) -> str | bytes:
+        try:
+            data = call(Priority.INTERACTIVE, Files().path_get, unquote(path))
+            if isinstance(data, (bytes, bytearray)):
+                try:
+                    return data.decode()
+                except UnicodeDecodeError:
+                    return bytes(data)
+            return json.dumps(data)
+        except Exception as exc:
+            raise RuntimeError(f"Failed to read file or directory: {str(exc)}") from exc
+
+    watcher = FileWatcher()
+
+    # FastMCP has no public API for subscriptions, so they are handled by its
+    # low-level server, which also needs to advertise that it supports them.
+    lowlevel = mcp._mcp_server
+
+    @lowlevel.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        await watcher.subscribe(str(uri), mcp.get_context().session)
+
+    @lowlevel.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        await watcher.unsubscribe(str(uri), mcp.get_context().session)
+
+    get_capabilities = lowlevel.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    lowlevel.get_capabilities = get_capabilities_with_subscribe
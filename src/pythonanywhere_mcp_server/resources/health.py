@@ -0,0 +1,19 @@
+import json
+
+from mcp.server.fastmcp import FastMCP
+
+from pythonanywhere_mcp_server import preflight
+
+
+def register_health_resources(mcp: FastMCP) -> None:
+    @mcp.resource(
+        "pythonanywhere://health",
+        name="health",
+        description=(
+            "Result of the connectivity check run at startup: whether the configured "
+            "PythonAnywhere site resolves and accepts the API token, with timings."
+        ),
+        mime_type="application/json",
+    )
+    def health() -> str:
+        return json.dumps(preflight.status(), indent=2)
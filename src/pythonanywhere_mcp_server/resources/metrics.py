@@ -0,0 +1,23 @@
+import json
+
+from mcp.server.fastmcp import FastMCP
+
+from pythonanywhere_mcp_server.breaker import breakers
+from pythonanywhere_mcp_server.scheduler import scheduler
+
+
+def register_metrics_resources(mcp: FastMCP) -> None:
+    @mcp.resource(
+        "pythonanywhere://metrics",
+        name="metrics",
+        description=(
+            "Server metrics: queue depth, running calls and wait times of API calls per priority class, "
+            "and the circuit breaker state of each API endpoint."
+        ),
+        mime_type="application/json",
+    )
+    def metrics() -> str:
+        return json.dumps({
+            "scheduler": scheduler.stats(),
+            "breakers": {name: breaker.stats() for name, breaker in breakers.items()},
+        }, indent=2)
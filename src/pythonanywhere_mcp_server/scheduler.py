@@ -0,0 +1,127 @@
+"""Priority scheduling of PythonAnywhere API calls shared by all tools."""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Callable
+
+
+class Priority(IntEnum):
+    """Classes of API work, most urgent first."""
+
+    INTERACTIVE = 0
+    MUTATION = 1
+    BULK = 2
+
+
+# Maximum number of API calls running at once in each class, and in total.
+# The total leaves room for every class at its limit, so however many
+# mutations and bulk transfers are running, interactive reads always have
+# their own slots free.
+DEFAULT_LIMITS = {Priority.INTERACTIVE: 4, Priority.MUTATION: 4, Priority.BULK: 8}
+DEFAULT_MAX_CONCURRENT = sum(DEFAULT_LIMITS.values())
+
+# Identifies the stream of work a call belongs to, such as one bulk batch.
+# Calls of the same class are granted round-robin across flows, so one large
+# job cannot starve another one queued behind it.
+current_flow: ContextVar[str] = ContextVar("current_flow", default="default")
+
+
+class Scheduler:
+    """
+    Admit API calls by priority class, with per-class and total concurrency caps.
+
+    The most urgent class with waiting calls and a free slot goes first; within
+    a class, flows take turns.  Queue depths and wait times are kept for
+    observability, see :meth:`stats`.
+    """
+
+    def __init__(self, limits: dict[Priority, int] | None = None, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        self.limits = DEFAULT_LIMITS | (limits or {})
+        self.max_concurrent = max_concurrent
+        self._condition = threading.Condition()
+        self._waiting: dict[Priority, OrderedDict[str, deque]] = {p: OrderedDict() for p in Priority}
+        self._running = {p: 0 for p in Priority}
+        self._completed = {p: 0 for p in Priority}
+        self._wait_total = {p: 0.0 for p in Priority}
+        self._wait_max = {p: 0.0 for p in Priority}
+
+    def _next(self) -> object | None:
+        """Return the waiting ticket allowed to start now, if any."""
+        if sum(self._running.values()) >= self.max_concurrent:
+            return None
+        for priority in Priority:
+            if self._waiting[priority] and self._running[priority] < self.limits[priority]:
+                queue = next(iter(self._waiting[priority].values()))
+                return queue[0]
+        return None
+
+    def _dequeue(self, priority: Priority, flow: str) -> None:
+        queue = self._waiting[priority][flow]
+        queue.popleft()
+        if queue:
+            self._waiting[priority].move_to_end(flow)
+        else:
+            del self._waiting[priority][flow]
+
+    @contextmanager
+    def slot(self, priority: Priority):
+        """Block until a call of `priority` may start, and hold its slot for the duration of the block."""
+        ticket = object()
+        flow = current_flow.get()
+        queued = time.monotonic()
+        with self._condition:
+            self._waiting[priority].setdefault(flow, deque()).append(ticket)
+            try:
+                while self._next() is not ticket:
+                    self._condition.wait()
+            except BaseException:
+                self._waiting[priority][flow].remove(ticket)
+                if not self._waiting[priority][flow]:
+                    del self._waiting[priority][flow]
+                self._condition.notify_all()
+                raise
+            self._dequeue(priority, flow)
+            self._running[priority] += 1
+            waited = time.monotonic() - queued
+            self._wait_total[priority] += waited
+            self._wait_max[priority] = max(self._wait_max[priority], waited)
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running[priority] -= 1
+                self._completed[priority] += 1
+                self._condition.notify_all()
+
+    def call(self, priority: Priority, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call `fn(*args, **kwargs)` once a slot of `priority` is free."""
+        with self.slot(priority):
+            return fn(*args, **kwargs)
+
+    def stats(self) -> dict:
+        """Return queue depth, running calls and wait times per priority class."""
+        with self._condition:
+            return {
+                priority.name.lower(): {
+                    "limit": self.limits[priority],
+                    "queued": sum(len(queue) for queue in self._waiting[priority].values()),
+                    "running": self._running[priority],
+                    "completed": self._completed[priority],
+                    "wait_avg_seconds": self._wait_total[priority] / max(1, self._completed[priority] + self._running[priority]),
+                    "wait_max_seconds": self._wait_max[priority],
+                }
+                for priority in Priority
+            } | {"max_concurrent": self.max_concurrent}
+
+
+scheduler = Scheduler()
+
+
+def call(priority: Priority, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Call `fn(*args, **kwargs)` through the server-wide scheduler."""
+    return scheduler.call(priority, fn, *args, **kwargs)
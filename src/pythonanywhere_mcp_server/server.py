@@ -1,11 +1,90 @@
+import functools
+import inspect
 import os
+import threading
+from typing import Any, Callable
 
+import anyio
 from mcp.server.fastmcp import FastMCP
 from . import __version__
+from .budget import apply_response_budget
+from .progress import current_cancel
+from .scheduler import current_flow
+from .tool_hooks import wrap_tools
+from .tracing import Tracer
 from .tools.file import register_file_tools
 from .tools.webapp import register_webapp_tools
 from .tools.website import register_website_tools
 from .tools.schedule import register_schedule_tools
+from .resources.file import register_file_resources
+from .resources.metrics import register_metrics_resources
+from .resources.health import register_health_resources
+
+
+async def _set_when_cancelled(cancel: threading.Event) -> None:
+    try:
+        await anyio.sleep_forever()
+    finally:
+        cancel.set()
+
+
+def _outcome(fn: Callable[[], Any]) -> tuple[Any, Exception | None]:
+    try:
+        return fn(), None
+    except Exception as exc:
+        return None, exc
+
+
+def _session_flow(mcp: FastMCP) -> str:
+    """Return the scheduler flow for the MCP session making the current request."""
+    try:
+        return f"session-{id(mcp.get_context().session):x}"
+    except ValueError:
+        # Called outside a request.
+        return current_flow.get()
+
+
+def run_sync_tools_in_threads(mcp: FastMCP) -> None:
+    """
+    Make tools registered with `mcp.tool()` run in worker threads when synchronous.
+
+    FastMCP calls synchronous tools on the event loop, so a long upload would
+    hold up every other request until it finished.
+
+    Each tool runs in the scheduler flow of the session that called it, so API
+    calls from different clients take turns instead of queueing in one flow.
+
+    A thread cannot be interrupted, so when the client cancels a call the
+    `current_cancel` event seen by the tool is set instead, and the call waits
+    for the tool to notice and stop.
+    """
+    def run_in_thread(name, fn):
+        if inspect.iscoroutinefunction(fn):
+            return fn
+
+        @functools.wraps(fn)
+        async def in_thread(*args, **kwargs):
+            cancel = threading.Event()
+            token = current_cancel.set(cancel)
+            flow_token = current_flow.set(_session_flow(mcp))
+            try:
+                async with anyio.create_task_group() as group:
+                    group.start_soon(_set_when_cancelled, cancel)
+                    result, error = await anyio.to_thread.run_sync(_outcome, functools.partial(fn, *args, **kwargs))
+                    group.cancel_scope.cancel()
+            finally:
+                current_flow.reset(flow_token)
+                current_cancel.reset(token)
+            # The client has already been told that a cancelled call ended, so
+            # raise the cancellation rather than send the tool's result or error.
+            await anyio.lowlevel.checkpoint_if_cancelled()
+            if error is not None:
+                raise error
+            return result
+
+        return in_thread
+
+    wrap_tools(mcp, run_in_thread)
 
 
 def create_server():
@@ -18,10 +97,20 @@ def create_server():
         raise RuntimeError("API_TOKEN environment variable must be set.")
 
     mcp = FastMCP("PythonAnywhere Model Context Protocol Server")
+    tracer = Tracer.from_environment()
+    if tracer:
+        wrap_tools(mcp, tracer.trace_tool)
+    run_sync_tools_in_threads(mcp)
+    if tracer:
+        wrap_tools(mcp, tracer.trace_run)
+    apply_response_budget(mcp)
 
     register_file_tools(mcp)
     register_website_tools(mcp)
     register_schedule_tools(mcp)
     register_webapp_tools(mcp)
+    register_file_resources(mcp)
+    register_metrics_resources(mcp)
+    register_health_resources(mcp)
 
-    return mcp
\ No newline at end of file
+    return mcp
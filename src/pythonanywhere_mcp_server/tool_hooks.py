@@ -0,0 +1,41 @@
+"""Helpers for adding behaviour around every tool the server registers."""
+
+import functools
+import inspect
+from typing import Any, Callable
+
+from mcp.server.fastmcp import FastMCP
+
+
+def wrap_tools(mcp: FastMCP, wrap: Callable[[str, Callable], Callable]) -> None:
+    """
+    Register `wrap(name, fn)` in place of every `fn` registered with `mcp.tool()` from now on.
+
+    The decorator still returns `fn` itself, so registering modules can keep
+    calling their functions directly.
+    """
+    tool = mcp.tool
+
+    def wrapping_tool(name=None, *args, **kwargs):
+        register = tool(name, *args, **kwargs)
+
+        def decorator(fn):
+            register(wrap(name or fn.__name__, fn))
+            return fn
+
+        return decorator
+
+    mcp.tool = wrapping_tool
+
+
+def wrap_result(fn: Callable, transform: Callable[[Any], Any]) -> Callable:
+    """Return `fn`, sync or async, with `transform` applied to its result and its signature preserved."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return transform(await fn(*args, **kwargs))
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return transform(fn(*args, **kwargs))
+    return wrapper
@@ -1,6 +1,543 @@
-from mcp.server.fastmcp import FastMCP
+import contextlib
+import hashlib
+import json
+import os
+import random
+import re
+import shlex
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator
 
+from mcp.server.fastmcp import Context, FastMCP
+
+from pythonanywhere_core.base import call_api
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
 from pythonanywhere_core.files import Files
+from pythonanywhere_core.schedule import Schedule
+from urllib3.response import HTTPResponse, MultiDecoder
+
+from pythonanywhere_mcp_server.concurrency import MAX_WORKERS, iter_concurrently, run_concurrently
+from pythonanywhere_mcp_server.progress import Progress, check_cancelled
+from pythonanywhere_mcp_server.scheduler import Priority, call
+from pythonanywhere_mcp_server.watch import DEFAULT_IGNORE
+
+# Size of the blocks streamed to and from disk during transfers.
+CHUNK_SIZE = 64 * 1024
+
+# Most entries the API returns for a directory tree; a listing this long may be incomplete.
+TREE_LIMIT = 1000
+
+# Name of the file, kept in the local directory, recording what `download_directory`
+# fetched so that later runs can skip unchanged files and resume partial ones.
+DOWNLOAD_MANIFEST = ".pythonanywhere-download.json"
+
+# Total size of file contents `search_files` keeps in memory between calls.
+SEARCH_CACHE_BYTES = 32 * 1024 * 1024
+
+# Upper bound on the file contents `upload_directory` holds in memory while
+# they are uploaded; the walk of the local tree waits for uploads below it.
+MAX_BUFFERED_BYTES = 64 * 1024 * 1024
+
+# Seconds to wait for the scheduled task extracting an uploaded archive, and between checks.
+ARCHIVE_TIMEOUT = 300
+ARCHIVE_POLL_INTERVAL = 5
+
+_search_cache: OrderedDict[str, tuple[dict, bytes]] = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+# SHA-256 of the content this server last wrote to each remote path, so
+# `upload_text_files` can skip files that would not change.
+_written: dict[str, str] = {}
+_written_lock = threading.Lock()
+
+
+def _remember_written(path: str, digest: str) -> None:
+    with _written_lock:
+        _written[path] = digest
+
+
+def _forget_written(path: str) -> None:
+    """Forget what this server wrote to `path` and, for a directory, everything below it."""
+    prefix = path.rstrip("/") + "/"
+    with _written_lock:
+        for written in [written for written in _written if written == path or written.startswith(prefix)]:
+            del _written[written]
+
+
+def _match_tree(root: str, pattern: str) -> list[str]:
+    """
+    Return paths under `root` (as listed by `Files().tree_get`) whose path relative to `root` matches `pattern`.
+
+    `root` itself is never matched, even by patterns such as '**'.
+    """
+    base = PurePosixPath(root)
+    matches = []
+    for path in call(Priority.INTERACTIVE, Files().tree_get, root):
+        relative = PurePosixPath(path.rstrip("/")).relative_to(base)
+        if relative != PurePosixPath(".") and relative.full_match(pattern):
+            matches.append(path)
+    return matches
+
+
+def _fold_nested(paths: Iterable[str]) -> tuple[list[str], dict[str, str]]:
+    """
+    Split `paths` into top-level paths and paths already covered by a listed parent.
+
+    Returns a list of paths to delete and a dictionary mapping each folded
+    path to the listed ancestor whose recursive delete removes it.
+    """
+    kept = {}
+    folded = {}
+    for path in sorted(set(paths), key=lambda p: p.rstrip("/")):
+        own = PurePosixPath(path)
+        parent = next((str(a) for a in (own, *own.parents) if str(a) in kept), None)
+        if parent is None:
+            kept[str(own)] = path
+        else:
+            folded[path] = kept[parent]
+    return list(kept.values()), folded
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _validators(response) -> dict:
+    return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+
+def _conditional_headers(validators: dict) -> dict:
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+class _CountingStream:
+    """
+    Iterate over the decoded body of a streamed response, counting the bytes that came over the network.
+
+    `requests` asks for gzip, deflate, brotli and zstd (where available).  The
+    body is read undecoded from the raw stream and decoded here, because
+    urllib3 does not count what it reads of chunked responses, which is how
+    servers usually send content they compress on the fly.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.received = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        modes = [mode.strip() for mode in self.response.headers.get("Content-Encoding", "").lower().split(",")]
+        modes = [mode for mode in modes if mode and mode != "identity"]
+        decoder = None
+        if modes and all(mode in HTTPResponse.CONTENT_DECODERS for mode in modes):
+            decoder = MultiDecoder(",".join(modes))
+        for chunk in self.response.raw.stream(CHUNK_SIZE, decode_content=False):
+            self.received += len(chunk)
+            if decoder:
+                chunk = decoder.decompress(chunk)
+            if chunk:
+                yield chunk
+        if decoder and (tail := decoder.flush()):
+            yield tail
+
+
+def _compression_note(received: int | None, size: int) -> str:
+    """Describe the bytes `received` over the network for `size` bytes of content, or nothing if unknown."""
+    if not received or not size:
+        return ""
+    return (
+        f"Transferred {_format_size(received)} for {_format_size(size)} of content"
+        f" (compression ratio {size / received:.1f}x)."
+    )
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _download_file(remote_path: str, local_path: Path, entry: dict) -> tuple[str, int, int]:
+    """
+    Stream a remote file to `local_path`, updating its manifest `entry` in place.
+
+    A complete local copy that still matches `entry` is revalidated with a
+    conditional request, and a leftover `.part` file is resumed with a range
+    request.  The server may ignore either, in which case the file is fetched
+    again in full.  A transfer stopped because the client cancelled the call is
+    kept as a `.part` file to resume.
+
+    Returns 'downloaded', 'resumed' or 'unchanged', with the number of bytes
+    received over the network and written to disk.
+    """
+    partial_path = local_path.with_name(local_path.name + ".part")
+    validator = entry.get("etag") or entry.get("last_modified")
+    headers = {}
+    offset = 0
+    if entry.get("partial") and validator and partial_path.is_file():
+        offset = partial_path.stat().st_size
+        # The `.part` file holds decoded bytes, while a compressing server
+        # would apply the range to the encoded ones.
+        headers["Accept-Encoding"] = "identity"
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    elif (
+        validator
+        and not entry.get("partial")
+        and local_path.is_file()
+        and entry.get("size") == local_path.stat().st_size
+        and entry.get("sha256") == _sha256(local_path)
+    ):
+        headers = _conditional_headers(entry)
+
+    response = call_api(f"{Files.path_endpoint}{remote_path}", "GET", stream=True, headers=headers)
+    with response:
+        if response.status_code == 304:
+            return "unchanged", 0, 0
+        if response.status_code not in (200, 206):
+            raise PythonAnywhereApiException(f"GET to fetch contents of {remote_path} failed, got {response}")
+        resumed = response.status_code == 206
+        if not resumed:
+            entry.clear()
+            entry.update(_validators(response), partial=True)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        body = _CountingStream(response)
+        with open(partial_path, "ab" if resumed else "wb") as f:
+            for chunk in body:
+                check_cancelled()
+                written += f.write(chunk)
+        received = body.received
+
+    partial_path.replace(local_path)
+    del entry["partial"]
+    entry.update(size=local_path.stat().st_size, sha256=_sha256(local_path))
+    return "resumed" if resumed else "downloaded", received, written
+
+
+class _HashingReader:
+    """Wrap a binary file to compute the SHA-256 of what is read from it."""
+
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        self.digest.update(data)
+        return data
+
+
+def _pack(local_dir: Path, ignore: list[str]) -> tuple[tempfile.TemporaryFile, dict]:
+    """
+    Write `local_dir` as a gzipped tarball to a temporary file, skipping names matching `ignore`.
+
+    Returns the temporary file, positioned at its start, and the size and
+    SHA-256 of each file packed, by path relative to `local_dir`, as hashed
+    while it was packed.
+    """
+    archive = tempfile.TemporaryFile()
+    packed = {}
+
+    def add(tar: tarfile.TarFile, path: Path, arcname: str) -> None:
+        if _is_ignored(PurePosixPath(path.name), ignore):
+            return
+        member = tar.gettarinfo(path, arcname)
+        if member.isfile():
+            with open(path, "rb") as f:
+                reader = _HashingReader(f)
+                tar.addfile(member, reader)
+            packed[arcname] = {"size": member.size, "sha256": reader.digest.hexdigest()}
+        else:
+            tar.addfile(member)
+        if member.isdir():
+            for child in sorted(path.iterdir()):
+                add(tar, child, f"{arcname}/{child.name}")
+
+    with tarfile.open(fileobj=archive, mode="w:gz", compresslevel=6) as tar:
+        for child in sorted(local_dir.iterdir()):
+            add(tar, child, child.name)
+    archive.seek(0)
+    return archive, packed
+
+
+def _extract_remotely(archive_path: str, remote_dir: str) -> None:
+    """
+    Extract an uploaded archive into `remote_dir` with a one-off scheduled task and wait for it.
+
+    The task is scheduled for the next full minute and writes the exit status of
+    `tar` to a marker file, which is polled for; the marker and the task are
+    removed afterwards.  The archive is removed by the task once extracted, and
+    here on every failure, including a cancelled call.
+    """
+    marker = f"{archive_path}.status"
+    command = (
+        f"mkdir -p {shlex.quote(remote_dir)} && tar -xzf {shlex.quote(archive_path)} -C {shlex.quote(remote_dir)}; "
+        f"echo $? > {shlex.quote(marker)}; rm -f {shlex.quote(archive_path)}"
+    )
+    start = datetime.now(timezone.utc) + timedelta(minutes=1 if datetime.now(timezone.utc).second < 50 else 2)
+    try:
+        task = call(
+            Priority.MUTATION,
+            Schedule().create,
+            {"command": command, "enabled": True, "interval": "daily", "hour": start.hour, "minute": start.minute},
+        )
+        try:
+            deadline = time.monotonic() + ARCHIVE_TIMEOUT
+            while True:
+                time.sleep(ARCHIVE_POLL_INTERVAL)
+                check_cancelled()
+                try:
+                    status = call(Priority.INTERACTIVE, Files().path_get, marker)
+                    break
+                except PythonAnywhereApiException:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"archive was not extracted within {ARCHIVE_TIMEOUT} seconds")
+        finally:
+            call(Priority.MUTATION, Schedule().delete, task["id"])
+    except BaseException:
+        # The task may have removed the archive already.
+        with contextlib.suppress(Exception):
+            call(Priority.MUTATION, Files().path_delete, archive_path)
+        raise
+    call(Priority.MUTATION, Files().path_delete, marker)
+    if status.strip() != b"0":
+        raise PythonAnywhereApiException(
+            f"extracting {archive_path} failed with exit status {status.strip().decode()}; see the scheduled task log"
+        )
+
+
+def _walk(local_dir: Path, ignore: list[str] = ()) -> Iterator[tuple[PurePosixPath, bool]]:
+    """
+    Yield `(relative path, is file)` for every file and every empty directory under `local_dir`.
+
+    Directories are read with `os.scandir` one at a time as the walk reaches
+    them, so the walk holds only the directories still to visit, however
+    large the tree.  Names matching `ignore` are skipped, and so is everything
+    below them.  Symlinked directories are not followed.
+    """
+    pending = [local_dir]
+    while pending:
+        directory = pending.pop()
+        empty = True
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if _is_ignored(PurePosixPath(entry.name), ignore):
+                    continue
+                empty = False
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.is_file():
+                    yield PurePosixPath(Path(entry.path).relative_to(local_dir).as_posix()), True
+        if empty and directory != local_dir:
+            yield PurePosixPath(directory.relative_to(local_dir).as_posix()), False
+
+
+def _upload_tree(
+    local_dir: Path,
+    remote_dir: str,
+    max_workers: int,
+    progress: Progress,
+    manifest: bool = False,
+    ignore: list[str] = (),
+) -> tuple[int, int, dict]:
+    """
+    Upload the files under `local_dir`, except names matching `ignore`, to `remote_dir` as the walk finds them.
+
+    Files are read just before upload, and only while the contents already read
+    and not yet uploaded total less than MAX_BUFFERED_BYTES, so memory use does
+    not grow with the size of the tree.  Empty directories are created with a
+    placeholder file, as `Files.tree_post` does.  Reports the files and bytes
+    uploaded so far to `progress`.  Stops at the first failure, or when the
+    client cancels the call.
+
+    Returns the number of files and bytes uploaded and, with `manifest`, their
+    manifest entries; without it the files are not hashed.
+    """
+    remote = remote_dir.rstrip("/")
+
+    def read():
+        for relative, is_file in _walk(local_dir, ignore):
+            check_cancelled()
+            yield f"{remote}/{relative}", (local_dir / relative).read_bytes() if is_file else None
+
+    def upload(item):
+        path, data = item
+        if data is None:
+            call(Priority.BULK, Files().path_post, f"{path}/.empty", b"")
+            call(Priority.BULK, Files().path_delete, f"{path}/.empty")
+        else:
+            call(Priority.BULK, Files().path_post, path, data)
+
+    count = size = 0
+    entries = {}
+    uploads = iter_concurrently(upload, read(), max_workers, weight=lambda item: len(item[1] or b""), max_weight=MAX_BUFFERED_BYTES)
+    with contextlib.closing(uploads):
+        for (path, data), outcome in uploads:
+            if isinstance(outcome, Exception):
+                raise outcome
+            if data is not None:
+                count += 1
+                size += len(data)
+                if manifest:
+                    entries[path] = {"size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+            progress.report(count, message=f"Uploaded {count} files ({_format_size(size)})")
+    return count, size, entries
+
+
+def _is_ignored(relative: PurePosixPath, ignore: list[str]) -> bool:
+    return any(PurePosixPath(part).full_match(pattern) for part in relative.parts for pattern in ignore)
+
+
+def _write_manifest(manifest_path: str, entries: dict) -> None:
+    """Add `entries` to the integrity manifest at `manifest_path`, creating it if needed."""
+    path = Path(manifest_path)
+    manifest = json.loads(path.read_text()) if path.is_file() else {"files": {}}
+    manifest["files"].update(entries)
+    path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+
+
+def _verify_file(path: str, expected: dict, hash_contents: bool) -> str:
+    """
+    Compare a remote file with its manifest entry.
+
+    The size is always checked first, from the Content-Length of a HEAD
+    request, and the contents are only downloaded when `hash_contents` is set
+    and the size matches, or when the server gives no length, in which case
+    they are streamed and counted instead.
+
+    Returns 'hashed', 'size ok', 'missing', 'size mismatch' or 'hash mismatch'.
+    """
+    url = f"{Files.path_endpoint}{path}"
+    # Without compression Content-Length is the size of the file itself.
+    response = call_api(url, "HEAD", headers={"Accept-Encoding": "identity"})
+    if response.status_code == 404:
+        return "missing"
+    length = response.headers.get("Content-Length") if response.status_code == 200 else None
+    if length is not None:
+        if int(length) != expected["size"]:
+            return "size mismatch"
+        if not hash_contents:
+            return "size ok"
+    response = call_api(url, "GET", stream=True)
+    with response:
+        if response.status_code == 404:
+            return "missing"
+        if response.status_code != 200:
+            raise PythonAnywhereApiException(f"GET to fetch contents of {path} failed, got {response}")
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            check_cancelled()
+            if hash_contents:
+                digest.update(chunk)
+            size += len(chunk)
+    if size != expected["size"]:
+        return "size mismatch"
+    if not hash_contents:
+        return "size ok"
+    return "hashed" if digest.hexdigest() == expected["sha256"] else "hash mismatch"
+
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Split a stream of byte chunks into decoded lines, yielding nothing for binary content."""
+    pending = b""
+    first = True
+    for chunk in chunks:
+        if first and b"\0" in chunk:
+            return
+        first = False
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r").decode(errors="replace")
+    if pending:
+        yield pending.rstrip(b"\r").decode(errors="replace")
+
+
+def _scan_lines(lines: Iterable[str], regex: re.Pattern, context: int) -> list[tuple[int, str, bool]]:
+    """Return `(line number, text, is_match)` for each matching line and its surrounding context."""
+    before = deque(maxlen=context)
+    hits = []
+    after = 0
+    for number, line in enumerate(lines, start=1):
+        if regex.search(line):
+            hits.extend(before)
+            before.clear()
+            hits.append((number, line, True))
+            after = context
+        elif after:
+            hits.append((number, line, False))
+            after -= 1
+        elif context:
+            before.append((number, line, False))
+    return hits
+
+
+def _cache_put(path: str, validators: dict, content: bytes) -> None:
+    with _search_cache_lock:
+        _search_cache.pop(path, None)
+        if not any(validators.values()) or len(content) > SEARCH_CACHE_BYTES:
+            return
+        _search_cache[path] = (validators, content)
+        while sum(len(cached) for _, cached in _search_cache.values()) > SEARCH_CACHE_BYTES:
+            _search_cache.popitem(last=False)
+
+
+def _cache_get(path: str) -> tuple[dict, bytes] | None:
+    with _search_cache_lock:
+        if path in _search_cache:
+            _search_cache.move_to_end(path)
+        return _search_cache.get(path)
+
+
+def _search_file(path: str, regex: re.Pattern, context: int) -> list[tuple[int, str, bool]]:
+    """
+    Scan a remote file for `regex` while it streams in.
+
+    Contents are cached together with their HTTP validators, so a file that is
+    unchanged since the previous search is revalidated instead of fetched again.
+    """
+    cached = _cache_get(path)
+    headers = _conditional_headers(cached[0]) if cached else {}
+    response = call_api(f"{Files.path_endpoint}{path}", "GET", stream=True, headers=headers)
+    with response:
+        if response.status_code == 304 and cached:
+            return _scan_lines(_iter_lines([cached[1]]), regex, context)
+        if response.status_code != 200:
+            raise PythonAnywhereApiException(f"GET to fetch contents of {path} failed, got {response}")
+        received = []
+        size = 0
+
+        def recorded(chunks):
+            nonlocal size
+            for chunk in chunks:
+                check_cancelled()
+                size += len(chunk)
+                if size <= SEARCH_CACHE_BYTES:
+                    received.append(chunk)
+                yield chunk
+
+        hits = _scan_lines(_iter_lines(recorded(response.iter_content(CHUNK_SIZE))), regex, context)
+    if size <= SEARCH_CACHE_BYTES:
+        _cache_put(path, _validators(response), b"".join(received))
+    return hits
 
 
 def register_file_tools(mcp: FastMCP) -> None:
@@ -9,7 +546,8 @@ def register_file_tools(mcp: FastMCP) -> None:
         """
         Return the contents of a file or a directory listing.
 
-        If the given path is a file, returns its contents as a string.
+        If the given path is a file, returns its contents as a string, followed by
+        the compression achieved when the transfer was compressed.
         If the path is a directory, returns a JSON string with its listing (recursively, up to 1000 entries).
 
         Args:
@@ -19,52 +557,322 @@ def register_file_tools(mcp: FastMCP) -> None:
             str: File contents or JSON directory listing.
         """
         try:
-            data = Files().path_get(path)
-            if isinstance(data, (bytes, bytearray)):
-                return data.decode()
-            return str(data)
+            response = call(Priority.INTERACTIVE, call_api, f"{Files.path_endpoint}{path}", "GET", stream=True)
+            with response:
+                if response.status_code != 200:
+                    raise PythonAnywhereApiException(f"GET to fetch contents of {path} failed, got {response}")
+                body = _CountingStream(response)
+                content = b"".join(body)
+            if "application/json" in response.headers.get("Content-Type", ""):
+                return str(json.loads(content))
+            if body.received == len(content):
+                return content.decode()
+            return f"{content.decode()}\n\n[{_compression_note(body.received, len(content))}]"
         except Exception as exc:
             raise RuntimeError(f"Failed to read file or directory: {str(exc)}") from exc
 
     @mcp.tool()
-    def upload_text_file(dest_path: str, content: str) -> str:
+    def upload_text_file(dest_path: str, content: str, manifest_path: str | None = None) -> str:
         """
         Create or replace a file with the given content (UTF-8 encoded).
 
         Args:
             dest_path (str): The absolute path where the file will be created or replaced.
             content (str): The text content to write to the file.
+            manifest_path (str, optional): Local path of an integrity manifest to record the
+                file's size and SHA-256 in, for checking later with `verify_upload`.
 
         Returns:
             str: Status message indicating upload result.
         """
         try:
-            status = Files().path_post(dest_path, content.encode())
+            data = content.encode()
+            status = call(Priority.MUTATION, Files().path_post, dest_path, data)
+            digest = hashlib.sha256(data).hexdigest()
+            _remember_written(dest_path, digest)
+            if manifest_path:
+                _write_manifest(manifest_path, {dest_path: {"size": len(data), "sha256": digest}})
             return f"Uploaded to {dest_path} (HTTP {status})."
         except Exception as exc:
             raise RuntimeError(f"Failed to upload text file: {str(exc)}") from exc
 
     @mcp.tool()
-    def upload_directory(local_dir_path: str, remote_dir_path: str) -> str:
+    def upload_text_files(
+        files: list[dict[str, str]],
+        force: bool = False,
+        manifest_path: str | None = None,
+        max_workers: int = MAX_WORKERS,
+        ctx: Context | None = None,
+    ) -> dict[str, str]:
+        """
+        Create or replace many files at once with the given contents (UTF-8 encoded).
+
+        Uploads run concurrently, reporting progress as they finish.  A file whose
+        content is identical to what this server last uploaded to the same path is
+        skipped; changes made to it
+        since by other means are not detected, so pass `force` to upload
+        everything regardless.
+
+        Args:
+            files (list[dict[str, str]]): The files to write, each a dictionary with the
+                absolute `path` of the file and its text `content`.
+            force (bool): Upload every file, including unchanged ones.
+            manifest_path (str, optional): Local path of an integrity manifest to record each
+                file's size and SHA-256 in, for checking later with `verify_upload`.
+            max_workers (int): Maximum number of uploads running at the same time.
+
+        Returns:
+            dict[str, str]: Status message for each path.
+        """
+        try:
+            contents = {file["path"]: file["content"].encode() for file in files}
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise RuntimeError(
+                "Failed to upload text files: each file must be a dictionary with 'path' and 'content' strings."
+            ) from exc
+
+        digests = {path: hashlib.sha256(data).hexdigest() for path, data in contents.items()}
+        with _written_lock:
+            unchanged = set() if force else {path for path, digest in digests.items() if _written.get(path) == digest}
+        pending = [path for path in contents if path not in unchanged]
+
+        def upload(path):
+            status = call(Priority.BULK, Files().path_post, path, contents[path])
+            _remember_written(path, digests[path])
+            return status
+
+        outcomes = run_concurrently(upload, pending, max_workers, Progress(ctx), "Uploaded {done} of {total} files")
+
+        results = {}
+        for path in contents:
+            if path in unchanged:
+                results[path] = "Unchanged since last upload; skipped."
+            elif isinstance(outcomes[path], Exception):
+                results[path] = f"Failed to upload text file: {str(outcomes[path])}"
+            else:
+                results[path] = f"Uploaded to {path} (HTTP {outcomes[path]})."
+        if manifest_path:
+            _write_manifest(manifest_path, {
+                path: {"size": len(contents[path]), "sha256": digests[path]}
+                for path in contents
+                if not isinstance(outcomes.get(path), Exception)
+            })
+        return results
+
+    @mcp.tool()
+    def upload_directory(
+        local_dir_path: str,
+        remote_dir_path: str,
+        archive: bool = False,
+        ignore: list[str] | None = None,
+        manifest_path: str | None = None,
+        max_workers: int = MAX_WORKERS,
+        ctx: Context | None = None,
+    ) -> str:
         """
         Upload a local directory to PythonAnywhere, preserving directory structure.
 
-        Recursively walks the local directory and uploads each file.
-        Empty directories are preserved.
+        Recursively walks the local directory and uploads the files concurrently
+        as it finds them, reporting progress as it goes.  Empty directories are
+        preserved.  Names matching `ignore` are left out in both modes.
+
+        With `archive`, the directory is instead packed into a single tar.gz,
+        uploaded in one request and extracted on PythonAnywhere by a temporary
+        scheduled task.  Use it for trees with thousands of files: it takes at
+        least a minute (scheduled tasks start on the minute) but replaces one
+        request per file with one request in total.
 
         Args:
             local_dir_path (str): The absolute path to the local directory to upload.
             remote_dir_path (str): The absolute path on PythonAnywhere where the directory will be uploaded.
+            archive (bool): Upload as a single archive extracted remotely.
+            ignore (list[str], optional): File and directory names (globs) to leave out.
+                Defaults to common VCS, cache and virtualenv directories such as '.git',
+                '__pycache__' and '.venv'; pass an empty list to upload everything.
+            manifest_path (str, optional): Local path of an integrity manifest to record each
+                uploaded file's size and SHA-256 in, for checking later with `verify_upload`.
+            max_workers (int): Maximum number of uploads running at the same time.
 
         Returns:
             str: Status message indicating upload result.
         """
+        _forget_written(remote_dir_path)
+        progress = Progress(ctx)
+        local_dir = Path(local_dir_path)
         try:
-            Files().tree_post(local_dir_path, remote_dir_path)
-            return f"Uploaded {local_dir_path} to {remote_dir_path}."
+            if not local_dir.is_dir():
+                raise ValueError(f"{local_dir_path} is not a directory")
+            ignore = DEFAULT_IGNORE if ignore is None else ignore
+            if archive:
+                remote_dir = remote_dir_path.rstrip("/")
+                archive_path = f"{remote_dir}/.pythonanywhere-upload-{uuid.uuid4().hex}.tar.gz"
+                packed, files = _pack(local_dir, ignore)
+                with packed:
+                    content = packed.read()
+                check_cancelled()
+                progress.report(0, 2, f"Uploading {len(files)} files in a {_format_size(len(content))} archive", force=True)
+                call(Priority.BULK, Files().path_post, archive_path, content)
+                progress.report(1, 2, "Waiting for the archive to be extracted", force=True)
+                _extract_remotely(archive_path, remote_dir)
+                if manifest_path:
+                    _write_manifest(manifest_path, {f"{remote_dir}/{name}": entry for name, entry in files.items()})
+                progress.report(2, 2, "Extracted", force=True)
+                return (
+                    f"Uploaded {local_dir_path} to {remote_dir_path}: "
+                    f"{len(files)} files in one {_format_size(len(content))} archive."
+                )
+            count, size, entries = _upload_tree(
+                local_dir, remote_dir_path, max_workers, progress, bool(manifest_path), ignore,
+            )
+            if manifest_path:
+                _write_manifest(manifest_path, entries)
+            progress.report(count, count, f"Uploaded {count} files ({_format_size(size)})", force=True)
+            return f"Uploaded {local_dir_path} to {remote_dir_path}: {count} files, {_format_size(size)}."
         except Exception as exc:
             raise RuntimeError(f"Failed to upload directory: {str(exc)}") from exc
 
+    @mcp.tool()
+    def verify_upload(
+        manifest_path: str, sample: float = 0.0, max_workers: int = MAX_WORKERS, ctx: Context | None = None,
+    ) -> str:
+        """
+        Check that the files recorded in an integrity manifest match their copies on PythonAnywhere.
+
+        Use it instead of uploading again "just to be safe".  Missing files are
+        found from the directory tree and sizes are compared from response
+        headers, without downloading where the server gives them.  Only the
+        contents of a `sample` fraction of the files of the right size are
+        downloaded and compared by SHA-256; by default none are.
+
+        Args:
+            manifest_path (str): Local path of a manifest written by `upload_directory`
+                or `upload_text_file`.
+            sample (float): Fraction (0 to 1) of size-matching files whose contents are
+                downloaded and hashed, e.g. 0.05 for a spot check.  Defaults to 0, checking sizes only.
+            max_workers (int): Maximum number of files checked at the same time.
+
+        Returns:
+            str: Summary of the check, listing every missing or mismatched file.
+        """
+        try:
+            files = json.loads(Path(manifest_path).read_text())["files"]
+            if not files:
+                return f"Verified 0 files from {manifest_path}: the manifest lists no files."
+            root = os.path.commonpath(list(files)) if len(files) > 1 else str(PurePosixPath(next(iter(files))).parent)
+        except Exception as exc:
+            raise RuntimeError(f"Failed to verify upload: {str(exc)}") from exc
+        try:
+            listing = {path.rstrip("/") for path in call(Priority.INTERACTIVE, Files().tree_get, root)}
+        except PythonAnywhereApiException:
+            # The directory itself is gone, or cannot be listed: each file's own check tells which.
+            listing = None
+
+        # The listing is capped at TREE_LIMIT entries, so only trust it for absent files when it is shorter.
+        complete = listing is not None and len(listing) < TREE_LIMIT
+        outcomes = {path: "missing" for path in files if complete and path not in listing}
+        present = [path for path in files if path not in outcomes]
+        hashed = set(random.sample(present, round(len(present) * min(max(sample, 0.0), 1.0))))
+        outcomes |= run_concurrently(
+            lambda path: call(Priority.BULK, _verify_file, path, files[path], path in hashed),
+            present,
+            max_workers,
+            Progress(ctx),
+            "Checked {done} of {total} files",
+        )
+
+        counts = {}
+        problems = []
+        for path, outcome in sorted(outcomes.items()):
+            if isinstance(outcome, Exception):
+                outcome = f"error: {str(outcome)}"
+            counts[outcome] = counts.get(outcome, 0) + 1
+            if outcome not in ("hashed", "size ok"):
+                problems.append(f"{path}: {outcome}")
+        ok = counts.get("hashed", 0) + counts.get("size ok", 0)
+        message = (
+            f"Verified {len(files)} files from {manifest_path}: {ok} match "
+            f"({counts.get('hashed', 0)} by SHA-256, {counts.get('size ok', 0)} by size), "
+            f"{len(problems)} missing or mismatched."
+        )
+        return "\n".join([message, *problems])
+
+    @mcp.tool()
+    def download_directory(
+        remote_dir_path: str, local_dir_path: str, max_workers: int = MAX_WORKERS, ctx: Context | None = None,
+    ) -> str:
+        """
+        Download a directory from PythonAnywhere to a local directory, preserving directory structure.
+
+        Files are fetched concurrently and streamed straight to disk, so binary
+        files are copied byte for byte.  Transfers are compressed whenever the
+        server supports it, and the result reports the compression achieved.
+        A manifest kept in the local directory lets later runs skip files that
+        are unchanged on both sides and resume transfers that were interrupted.
+        The remote listing is limited to 1000 entries, and the result warns when
+        it reaches that limit, as files beyond it are not downloaded.
+
+        Args:
+            remote_dir_path (str): The absolute path of the directory on PythonAnywhere.
+            local_dir_path (str): The absolute path to the local directory to download into.
+            max_workers (int): Maximum number of files downloaded at the same time.
+
+        Returns:
+            str: Status message with the number of files downloaded, resumed, unchanged and failed,
+                and the bytes transferred.
+        """
+        try:
+            remote_dir = PurePosixPath(remote_dir_path)
+            local_dir = Path(local_dir_path)
+            local_dir.mkdir(parents=True, exist_ok=True)
+            manifest_path = local_dir / DOWNLOAD_MANIFEST
+            manifest = json.loads(manifest_path.read_text()) if manifest_path.is_file() else {}
+
+            files = {}
+            listing = call(Priority.INTERACTIVE, Files().tree_get, remote_dir_path)
+            for path in listing:
+                relative = PurePosixPath(path.rstrip("/")).relative_to(remote_dir).as_posix()
+                if path.endswith("/"):
+                    (local_dir / relative).mkdir(parents=True, exist_ok=True)
+                else:
+                    files[path] = relative
+                    manifest.setdefault(relative, {})
+
+            try:
+                outcomes = run_concurrently(
+                    lambda path: call(Priority.BULK, _download_file, path, local_dir / files[path], manifest[files[path]]),
+                    files,
+                    max_workers,
+                    Progress(ctx),
+                    "Downloaded {done} of {total} files",
+                )
+            finally:
+                manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        except Exception as exc:
+            raise RuntimeError(f"Failed to download directory: {str(exc)}") from exc
+
+        counts = {"downloaded": 0, "resumed": 0, "unchanged": 0}
+        received = written = 0
+        failures = []
+        for path, outcome in sorted(outcomes.items()):
+            if isinstance(outcome, Exception):
+                failures.append(f"{path}: {str(outcome)}")
+            else:
+                counts[outcome[0]] += 1
+                received += outcome[1]
+                written += outcome[2]
+        message = (
+            f"Downloaded {remote_dir_path} to {local_dir_path}: {counts['downloaded']} downloaded, "
+            f"{counts['resumed']} resumed, {counts['unchanged']} unchanged, {len(failures)} failed."
+        )
+        if note := _compression_note(received, written):
+            message += f" {note}"
+        if len(listing) >= TREE_LIMIT:
+            message += (
+                f" Warning: the remote listing reached its limit of {TREE_LIMIT} entries, so some files may not"
+                " have been downloaded; download the subdirectories separately to get them all."
+            )
+        return "\n".join([message, *failures])
+
     @mcp.tool()
     def delete_path(path: str) -> str:
         """
@@ -76,12 +884,142 @@ def register_file_tools(mcp: FastMCP) -> None:
         Returns:
             str: Status message indicating deletion result.
         """
+        _forget_written(path)
         try:
-            Files().path_delete(path)
+            call(Priority.MUTATION, Files().path_delete, path)
             return f"Deleted {path}."
         except Exception as exc:
             raise RuntimeError(f"Failed to delete path: {str(exc)}") from exc
 
+    @mcp.tool()
+    def delete_paths(
+        paths: list[str] | None = None,
+        root: str | None = None,
+        pattern: str | None = None,
+        max_workers: int = MAX_WORKERS,
+        ctx: Context | None = None,
+    ) -> dict[str, str]:
+        """
+        Permanently delete many files or directories at once (recursively for directories).
+
+        Paths can be given explicitly, selected with a glob pattern evaluated against
+        the tree of `root`, or both. When a directory and some of its contents are
+        selected, only the directory is deleted. Deletions run concurrently.
+
+        Args:
+            paths (list[str], optional): Absolute paths to delete.
+            root (str, optional): Absolute path of the directory to match `pattern` against.
+            pattern (str, optional): Glob matched against paths relative to `root`
+                (e.g. 'releases/*', '**/*.log', 'cache/**').
+            max_workers (int): Maximum number of deletions running at the same time.
+
+        Returns:
+            dict[str, str]: Status message for each selected path.
+        """
+        if pattern and not root:
+            raise RuntimeError("Failed to delete paths: `root` is required when `pattern` is given.")
+        try:
+            selected = list(paths or [])
+            if pattern:
+                selected.extend(_match_tree(root, pattern))
+        except Exception as exc:
+            raise RuntimeError(f"Failed to delete paths: {str(exc)}") from exc
+
+        targets, folded = _fold_nested(selected)
+        for path in targets:
+            _forget_written(path)
+        outcomes = run_concurrently(
+            lambda path: call(Priority.BULK, Files().path_delete, path),
+            targets,
+            max_workers,
+            Progress(ctx),
+            "Deleted {done} of {total} paths",
+        )
+
+        results = {}
+        for path in targets:
+            if isinstance(outcomes[path], Exception):
+                results[path] = f"Failed to delete path: {str(outcomes[path])}"
+            else:
+                results[path] = f"Deleted {path}."
+        for path, parent in folded.items():
+            if isinstance(outcomes[parent], Exception):
+                results[path] = results[parent]
+            else:
+                results[path] = f"Deleted with {parent}."
+        return results
+
+    @mcp.tool()
+    def search_files(
+        root: str,
+        regex: str,
+        include: list[str] | None = None,
+        context_lines: int = 0,
+        max_results: int = 200,
+        max_workers: int = MAX_WORKERS,
+        ctx: Context | None = None,
+    ) -> str:
+        """
+        Search the contents of files under a directory for a regular expression.
+
+        Files are fetched concurrently and scanned as they stream in; only matching
+        lines (and optional context) are returned, in grep-like format:
+        `path:line:text` for matches and `path-line-text` for context lines.
+        Binary files are skipped.  Contents of files searched before are reused
+        when the server reports them unchanged.  The remote listing is limited to
+        1000 entries.
+
+        Args:
+            root (str): The absolute path of the directory to search.
+            regex (str): Python regular expression matched against each line.
+            include (list[str], optional): Globs matched against paths relative to `root`
+                (e.g. ['**/*.py', 'config/*.ini']).  All files are searched if omitted.
+            context_lines (int): Number of lines of context to show around each match.
+            max_results (int): Maximum number of output lines to return.
+            max_workers (int): Maximum number of files fetched at the same time.
+
+        Returns:
+            str: Matching lines with context, or a message saying nothing matched.
+        """
+        try:
+            compiled = re.compile(regex)
+            base = PurePosixPath(root)
+            candidates = [
+                path for path in call(Priority.INTERACTIVE, Files().tree_get, root)
+                if not path.endswith("/") and (
+                    not include
+                    or any(PurePosixPath(path).relative_to(base).full_match(glob) for glob in include)
+                )
+            ]
+        except Exception as exc:
+            raise RuntimeError(f"Failed to search files: {str(exc)}") from exc
+
+        outcomes = run_concurrently(
+            lambda path: call(Priority.BULK, _search_file, path, compiled, context_lines),
+            candidates,
+            max_workers,
+            Progress(ctx),
+            "Searched {done} of {total} files",
+        )
+
+        output = []
+        for path in sorted(outcomes):
+            if isinstance(outcomes[path], Exception):
+                output.append(f"{path}: Failed to search file: {str(outcomes[path])}")
+                continue
+            previous = None
+            for number, text, is_match in outcomes[path]:
+                if context_lines and previous is not None and number > previous + 1:
+                    output.append("--")
+                output.append(f"{path}{':' if is_match else '-'}{number}{':' if is_match else '-'}{text}")
+                previous = number
+        if not output:
+            return f"No matches for {regex!r} in {len(candidates)} files under {root}."
+        if len(output) > max_results:
+            omitted = len(output) - max_results
+            output = output[:max_results] + [f"... {omitted} more lines omitted; narrow `include` or `regex`."]
+        return "\n".join(output)
+
     @mcp.tool()
     def tree(path: str) -> list[str]:
         """
@@ -95,7 +1033,7 @@ def register_file_tools(mcp: FastMCP) -> None:
             List[str]: List of absolute paths contained in the directory.
         """
         try:
-            listing = Files().tree_get(path)
+            listing = call(Priority.INTERACTIVE, Files().tree_get, path)
             return listing
         except Exception as exc:
             raise RuntimeError(f"Failed to get directory tree: {str(exc)}") from exc
@@ -2,6 +2,8 @@ from mcp.server.fastmcp import FastMCP
 
 from pythonanywhere_core.schedule import Schedule
 
+from pythonanywhere_mcp_server.scheduler import Priority, call
+
 
 def register_schedule_tools(mcp: FastMCP) -> None:
     @mcp.tool()
@@ -15,7 +17,7 @@ def register_schedule_tools(mcp: FastMCP) -> None:
 
         """
         try:
-            return Schedule().get_list()
+            return call(Priority.INTERACTIVE, Schedule().get_list)
         except Exception as exc:
             raise RuntimeError(f"Failed to list scheduled tasks: {str(exc)}") from exc
 
@@ -36,7 +38,7 @@ def register_schedule_tools(mcp: FastMCP) -> None:
             dict: Dictionary with created task specs.
         """
         try:
-            return Schedule().create(params)
+            return call(Priority.MUTATION, Schedule().create, params)
         except Exception as exc:
             raise RuntimeError(f"Failed to create scheduled task: {str(exc)}") from exc
 
@@ -52,7 +54,7 @@ def register_schedule_tools(mcp: FastMCP) -> None:
             bool: True if deletion was successful.
         """
         try:
-            return Schedule().delete(task_id)
+            return call(Priority.MUTATION, Schedule().delete, task_id)
         except Exception as exc:
             raise RuntimeError(f"Failed to delete scheduled task: {str(exc)}") from exc
 
@@ -68,7 +70,7 @@ def register_schedule_tools(mcp: FastMCP) -> None:
             dict: Dictionary of the task's specifications.
         """
         try:
-            return Schedule().get_specs(task_id)
+            return call(Priority.INTERACTIVE, Schedule().get_specs, task_id)
         except Exception as exc:
             raise RuntimeError(f"Failed to get scheduled task: {str(exc)}") from exc
 
@@ -86,6 +88,6 @@ def register_schedule_tools(mcp: FastMCP) -> None:
             dict: Dictionary with updated task specs.
         """
         try:
-            return Schedule().update(task_id, params)
+            return call(Priority.MUTATION, Schedule().update, task_id, params)
         except Exception as exc:
             raise RuntimeError(f"Failed to update scheduled task: {str(exc)}") from exc
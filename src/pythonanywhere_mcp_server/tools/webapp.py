@@ -6,6 +6,8 @@ from pythonanywhere_core.webapp import Webapp
 from pythonanywhere_core.base import AuthenticationError, NoTokenError
 from pythonanywhere_core.exceptions import MissingCNAMEException
 
+from pythonanywhere_mcp_server.scheduler import Priority, call
+
 # ToDo: Add the log file functions once pythonanywhere-core webapp log file functions
 # have been improved
 
@@ -27,7 +29,7 @@ def register_webapp_tools(mcp: FastMCP) -> None:
             str: Status message indicating reload's result.
         """
         try:
-            Webapp(domain).reload()
+            call(Priority.MUTATION, Webapp(domain).reload)
             return f"Webapp '{domain}' reloaded."
         except MissingCNAMEException as exc:
             return f"Webapp '{domain}' reloaded. Note: {str(exc)}"
@@ -70,7 +72,9 @@ def register_webapp_tools(mcp: FastMCP) -> None:
         """
         try:
             webapp = Webapp(domain)
-            webapp.create(
+            call(
+                Priority.MUTATION,
+                webapp.create,
                 python_version=python_version,
                 virtualenv_path=Path(virtualenv_path),
                 project_path=Path(project_path),
@@ -102,7 +106,7 @@ def register_webapp_tools(mcp: FastMCP) -> None:
             RuntimeError: If authentication fails, webapp doesn't exist, or other API errors occur.
         """
         try:
-            Webapp(domain).delete()
+            call(Priority.MUTATION, Webapp(domain).delete)
             return f"Webapp '{domain}' deleted successfully."
         except (AuthenticationError, NoTokenError):
             raise RuntimeError("Authentication failed — check API_TOKEN and domain.")
@@ -158,7 +162,7 @@ def register_webapp_tools(mcp: FastMCP) -> None:
             RuntimeError: If authentication fails, webapp doesn't exist, or other API errors occur.
         """
         try:
-            result = Webapp(domain).patch(data)
+            result = call(Priority.MUTATION, Webapp(domain).patch, data)
             return result
         except (AuthenticationError, NoTokenError):
             raise RuntimeError("Authentication failed — check API_TOKEN and domain.")
@@ -189,7 +193,7 @@ def register_webapp_tools(mcp: FastMCP) -> None:
             RuntimeError: If authentication fails or other API errors occur.
         """
         try:
-            result = Webapp.list_webapps()
+            result = call(Priority.INTERACTIVE, Webapp.list_webapps)
             return result
         except (AuthenticationError, NoTokenError):
             raise RuntimeError("Authentication failed — check API_TOKEN.")
@@ -229,7 +233,7 @@ def register_webapp_tools(mcp: FastMCP) -> None:
             RuntimeError: If authentication fails, webapp doesn't exist, or other API errors occur.
         """
         try:
-            result = Webapp(domain).get()
+            result = call(Priority.INTERACTIVE, Webapp(domain).get)
             return result
         except (AuthenticationError, NoTokenError):
             raise RuntimeError("Authentication failed — check API_TOKEN and domain.")
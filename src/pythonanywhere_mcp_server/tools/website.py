@@ -5,6 +5,8 @@ from mcp.server.fastmcp import FastMCP
 from pythonanywhere_core.website import Website
 from pythonanywhere_core.base import AuthenticationError, NoTokenError
 
+from pythonanywhere_mcp_server.scheduler import Priority, call
+
 
 def register_website_tools(mcp: FastMCP) -> None:
     @mcp.tool()
@@ -24,7 +26,7 @@ def register_website_tools(mcp: FastMCP) -> None:
             str: Status message indicating reload result.
         """
         try:
-            Website().reload(domain)
+            call(Priority.MUTATION, Website().reload, domain)
             return f"Website '{domain}' reloaded."
         except (AuthenticationError, NoTokenError):
             raise RuntimeError("Authentication failed — check API_TOKEN and domain.")
@@ -48,7 +50,7 @@ def register_website_tools(mcp: FastMCP) -> None:
 
         """
         try:
-            return Website().list()
+            return call(Priority.INTERACTIVE, Website().list)
         except Exception as exc:
             raise RuntimeError(f"Failed to list websites: {str(exc)}") from exc
 
@@ -86,7 +88,7 @@ def register_website_tools(mcp: FastMCP) -> None:
             dict: A dictionary containing information about the created website.
         """
         try:
-            return Website().create(domain_name, command)
+            return call(Priority.MUTATION, Website().create, domain_name, command)
         except Exception as exc:
             raise RuntimeError(f"Failed to create website: {str(exc)}") from exc
 
@@ -102,6 +104,6 @@ def register_website_tools(mcp: FastMCP) -> None:
             dict: Empty dictionary on success.
         """
         try:
-            return Website().delete(domain_name)
+            return call(Priority.MUTATION, Website().delete, domain_name)
         except Exception as exc:
             raise RuntimeError(f"Failed to delete website: {str(exc)}") from exc
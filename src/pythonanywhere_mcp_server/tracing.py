@@ -0,0 +1,233 @@
+"""Opt-in tracing and profiling of tool calls."""
+
+import asyncio
+import cProfile
+import functools
+import hashlib
+import inspect
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlparse
+
+import requests
+from mcp.server.fastmcp import Context
+
+# Path of the JSONL file spans are appended to; tracing is off when unset.
+TRACE_ENV = "PYTHONANYWHERE_TRACE"
+
+# Tool calls taking at least this many seconds have their cProfile stats kept.
+PROFILE_SLOW_ENV = "PYTHONANYWHERE_PROFILE_SLOW"
+
+# Fraction of tool calls profiled when PYTHONANYWHERE_PROFILE_SLOW is set.
+PROFILE_SAMPLE_ENV = "PYTHONANYWHERE_PROFILE_SAMPLE"
+
+
+class _Trace:
+    """Spans recorded for one tool call, shared with the threads working on it."""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.root_id = uuid.uuid4().hex[:16]
+        self.started = time.time()
+        self.spans: list[dict] = []
+        self.profile: str | None = None
+        self.lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, parent: str | None = None, **attributes) -> str:
+        span_id = uuid.uuid4().hex[:16]
+        with self.lock:
+            self.spans.append({
+                "trace_id": self.trace_id,
+                "span_id": span_id,
+                "parent_id": parent or self.root_id,
+                "name": name,
+                "start": start,
+                "duration_ms": round((end - start) * 1000, 3),
+                "attributes": attributes,
+            })
+        return span_id
+
+
+_current_trace: ContextVar[_Trace | None] = ContextVar("current_trace", default=None)
+
+
+def _arguments_hash(kwargs: dict) -> str:
+    arguments = {key: value for key, value in kwargs.items() if not isinstance(value, Context)}
+    return hashlib.sha256(json.dumps(arguments, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _request_size(kwargs: dict) -> int | None:
+    if "files" in kwargs:
+        return sum(len(content) for content in kwargs["files"].values() if isinstance(content, (bytes, str)))
+    if isinstance(kwargs.get("data"), (bytes, str)):
+        return len(kwargs["data"])
+    return None
+
+
+def _describe_error(exc: BaseException) -> str:
+    """Return the `error` attribute recorded for a tool call that raised `exc`."""
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    return f"{type(exc).__name__}: {exc}"
+
+
+class Tracer:
+    """
+    Write a span-structured JSONL trace of every tool call to `path`.
+
+    Each call gives a root `tool` span, with the tool name, a hash of its
+    arguments and the size of its result, and child spans for the wait for a
+    worker thread (`queue`), the tool itself (`run`), every API request it
+    made (`http`) and encoding the result (`encode`).  Spans share a
+    `trace_id` and point at their parent with `parent_id`.
+
+    With `profile_slow` set, a `profile_sample` fraction of calls run under
+    cProfile, and the stats of those taking at least `profile_slow` seconds
+    are saved as `.pstats` files in `<path>.profiles/`, for `python -m pstats`
+    or snakeviz.  Only the tool's own thread is profiled, not threads it fans
+    work out to.
+    """
+
+    def __init__(self, path: str, profile_slow: float | None = None, profile_sample: float = 1.0):
+        self.path = Path(path)
+        self.profile_slow = profile_slow
+        self.profile_sample = profile_sample
+        self.profile_dir = self.path.with_name(f"{self.path.name}.profiles")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "Tracer | None":
+        """Return a tracer configured from the environment, or None if tracing is off."""
+        path = os.getenv(TRACE_ENV)
+        if not path:
+            return None
+        slow = os.getenv(PROFILE_SLOW_ENV)
+        return cls(path, float(slow) if slow else None, float(os.getenv(PROFILE_SAMPLE_ENV) or 1.0))
+
+    def _write(self, spans: list[dict]) -> None:
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        with self._lock, self.path.open("a") as file:
+            file.write(lines)
+
+    def trace_tool(self, name: str, fn: Callable) -> Callable:
+        """Wrap tool `fn` to record its root span; register it outside all other tool wrappers."""
+        def finish(trace, kwargs, result, error):
+            encoded = time.time()
+            size = len(json.dumps(result, default=str)) if error is None else None
+            end = time.time()
+            if error is None:
+                trace.add("encode", encoded, end)
+            attributes = {
+                "tool": name,
+                "arguments_sha256": _arguments_hash(kwargs),
+                "result_bytes": size,
+                "upstream_requests": sum(span["name"] == "http" for span in trace.spans),
+                "error": error,
+            }
+            if trace.profile:
+                attributes["profile"] = trace.profile
+            root = {
+                "trace_id": trace.trace_id,
+                "span_id": trace.root_id,
+                "parent_id": None,
+                "name": "tool",
+                "start": trace.started,
+                "duration_ms": round((end - trace.started) * 1000, 3),
+                "attributes": attributes,
+            }
+            self._write([root, *sorted(trace.spans, key=lambda span: span["start"])])
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def traced(*args, **kwargs):
+                trace = _Trace()
+                token = _current_trace.set(trace)
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException as exc:
+                    finish(trace, kwargs, None, _describe_error(exc))
+                    raise
+                finally:
+                    _current_trace.reset(token)
+                finish(trace, kwargs, result, None)
+                return result
+        else:
+            @functools.wraps(fn)
+            def traced(*args, **kwargs):
+                trace = _Trace()
+                token = _current_trace.set(trace)
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    finish(trace, kwargs, None, _describe_error(exc))
+                    raise
+                finally:
+                    _current_trace.reset(token)
+                finish(trace, kwargs, result, None)
+                return result
+        return traced
+
+    def trace_run(self, name: str, fn: Callable) -> Callable:
+        """Wrap tool `fn` to record its `run` span and profile; register it inside the worker thread wrapper."""
+        if inspect.iscoroutinefunction(fn):
+            return fn
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            start = time.time()
+            trace.add("queue", trace.started, start)
+            profiler = None
+            if self.profile_slow is not None and random.random() < self.profile_sample:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                end = time.time()
+                trace.add("run", start, end)
+                if profiler:
+                    profiler.disable()
+                    if end - start >= self.profile_slow:
+                        self.profile_dir.mkdir(parents=True, exist_ok=True)
+                        path = self.profile_dir / f"{re.sub(r'[^\w-]', '_', name)}-{trace.trace_id}.pstats"
+                        profiler.dump_stats(path)
+                        trace.profile = str(path)
+
+        return run
+
+
+def traced_request(request: Callable[..., requests.Response]) -> Callable[..., requests.Response]:
+    """Wrap a `requests.request`-like function to record an `http` span in the current trace, if any."""
+    @functools.wraps(request)
+    def traced(method: str, url: str, **kwargs) -> requests.Response:
+        trace = _current_trace.get()
+        if trace is None:
+            return request(method, url, **kwargs)
+        start = time.time()
+        status = None
+        response_size = None
+        try:
+            response = request(method, url, **kwargs)
+            status = response.status_code
+            length = response.headers.get("Content-Length")
+            response_size = int(length) if length else None
+            return response
+        finally:
+            trace.add(
+                "http", start, time.time(),
+                method=method, path=urlparse(url).path, status=status,
+                request_bytes=_request_size(kwargs), response_bytes=response_size,
+            )
+
+    return traced
@@ -0,0 +1,155 @@
+"""Watch a local directory and push changes to PythonAnywhere as they happen."""
+
+import os
+import sys
+import time
+from pathlib import Path, PurePosixPath
+from typing import Callable
+
+from pythonanywhere_core.files import Files
+from pythonanywhere_core.webapp import Webapp
+from pythonanywhere_core.website import Website
+from pythonanywhere_core.exceptions import MissingCNAMEException
+
+from pythonanywhere_mcp_server import __version__
+from pythonanywhere_mcp_server.concurrency import MAX_WORKERS, run_concurrently
+from pythonanywhere_mcp_server.scheduler import Priority, call
+
+# Names of files and directories that are never pushed.
+DEFAULT_IGNORE = [".git", ".hg", ".svn", "__pycache__", "*.pyc", ".venv", "venv", "node_modules", ".DS_Store", "*.swp", "*~"]
+
+# Seconds between scans of the local directory.
+POLL_INTERVAL = 0.5
+
+# Seconds without further changes after which a burst of changes is pushed.
+DEBOUNCE = 1.0
+
+
+def snapshot(local_dir: str, ignore: list[str] = DEFAULT_IGNORE) -> dict[str, tuple[int, int]]:
+    """
+    Return `(mtime_ns, size)` for every file under `local_dir`, keyed by POSIX relative path.
+
+    Entries whose name matches one of the `ignore` globs are skipped, including
+    everything below ignored directories.
+    """
+    files = {}
+    pending = [Path(local_dir)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if any(PurePosixPath(entry.name).full_match(pattern) for pattern in ignore):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    relative = Path(entry.path).relative_to(local_dir).as_posix()
+                    files[relative] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def diff(old: dict, new: dict) -> tuple[list[str], list[str]]:
+    """Return the relative paths changed or added, and those removed, between two snapshots."""
+    changed = sorted(path for path, state in new.items() if old.get(path) != state)
+    removed = sorted(path for path in old if path not in new)
+    return changed, removed
+
+
+def reload(domain: str, website: bool = False) -> str:
+    """Reload the uWSGI webapp (or ASGI website) serving `domain`."""
+    if website:
+        call(Priority.MUTATION, Website().reload, domain)
+        return f"Website '{domain}' reloaded."
+    try:
+        call(Priority.MUTATION, Webapp(domain).reload)
+    except MissingCNAMEException:
+        pass
+    return f"Webapp '{domain}' reloaded."
+
+
+def push(
+    local_dir: str,
+    remote_dir: str,
+    changed: list[str],
+    removed: list[str],
+    max_workers: int = MAX_WORKERS,
+) -> dict:
+    """
+    Upload `changed` and delete `removed` (paths relative to both directories) concurrently.
+
+    Returns a dictionary mapping each remote path to the API status code or the exception raised.
+    """
+    remote = remote_dir.rstrip("/")
+
+    def upload(relative):
+        return call(Priority.BULK, Files().path_post, f"{remote}/{relative}", (Path(local_dir) / relative).read_bytes())
+
+    def delete(relative):
+        return call(Priority.BULK, Files().path_delete, f"{remote}/{relative}")
+
+    actions = {relative: upload for relative in changed} | {relative: delete for relative in removed}
+    outcomes = run_concurrently(lambda relative: actions[relative](relative), actions, max_workers)
+    return {f"{remote}/{relative}": outcome for relative, outcome in outcomes.items()}
+
+
+def watch(
+    local_dir: str,
+    remote_dir: str,
+    domain: str | None = None,
+    website: bool = False,
+    ignore: list[str] = DEFAULT_IGNORE,
+    interval: float = POLL_INTERVAL,
+    debounce: float = DEBOUNCE,
+    max_workers: int = MAX_WORKERS,
+    log: Callable[[str], None] = lambda message: print(message, file=sys.stderr),
+    iterations: int | None = None,
+) -> None:
+    """
+    Push changes under `local_dir` to `remote_dir` until interrupted.
+
+    The directory is scanned every `interval` seconds.  Changes are collected
+    until no new ones have been seen for `debounce` seconds, then the touched
+    files are uploaded (and removed files deleted) concurrently, followed by a
+    single reload of `domain` if given.  `iterations` limits the number of
+    scans, for tests.
+    """
+    if not Path(local_dir).is_dir():
+        raise ValueError(f"{local_dir} is not a directory")
+    os.environ["PYTHONANYWHERE_CLIENT"] = f"mcp-server/{__version__}"
+    log(f"Watching {local_dir} -> {remote_dir} (Ctrl+C to stop)")
+    synced = snapshot(local_dir, ignore)
+    last_change = None
+    current = synced
+    while iterations is None or iterations > 0:
+        if iterations is not None:
+            iterations -= 1
+        time.sleep(interval)
+        latest = snapshot(local_dir, ignore)
+        if latest != current:
+            current = latest
+            last_change = time.monotonic()
+            continue
+        if last_change is None or time.monotonic() - last_change < debounce:
+            continue
+
+        changed, removed = diff(synced, current)
+        last_change = None
+        if not changed and not removed:
+            continue
+        started = time.monotonic()
+        outcomes = push(local_dir, remote_dir, changed, removed, max_workers)
+        failures = {path: outcome for path, outcome in outcomes.items() if isinstance(outcome, Exception)}
+        for path, exc in sorted(failures.items()):
+            log(f"Failed to push {path}: {exc}")
+        # Failed paths stay out of the synced snapshot so they are retried with the next burst.
+        synced = {
+            path: state for path, state in current.items()
+            if f"{remote_dir.rstrip('/')}/{path}" not in failures
+        } | {path: synced[path] for path in removed if f"{remote_dir.rstrip('/')}/{path}" in failures}
+        summary = f"Pushed {len(changed)} changed and {len(removed)} removed files"
+        if domain and not failures:
+            try:
+                summary += f"; {reload(domain, website)}"
+            except Exception as exc:
+                summary += f"; reload failed: {exc}"
+        log(f"{summary} in {time.monotonic() - started:.1f}s.")
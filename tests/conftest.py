@@ -1,16 +1,76 @@
 import pytest
 
+
+class MockLowLevelServer:
+    def __init__(self):
+        self.request_handlers = {}
+    def subscribe_resource(self):
+        def decorator(fn):
+            self.request_handlers["subscribe"] = fn
+            return fn
+        return decorator
+    def unsubscribe_resource(self):
+        def decorator(fn):
+            self.request_handlers["unsubscribe"] = fn
+            return fn
+        return decorator
+    def get_capabilities(self, notification_options, experimental_capabilities):
+        from mcp import types
+        return types.ServerCapabilities(resources=types.ResourcesCapability(subscribe=False))
+
+
+class FakeRawStream:
+    def __init__(self, wire):
+        self.wire = wire
+
+    def stream(self, chunk_size, decode_content=True):
+        for start in range(0, len(self.wire), chunk_size):
+            yield self.wire[start:start + chunk_size]
+
+
+class FakeResponse:
+    """Stand-in for the streamed `requests.Response` returned by `call_api`."""
+
+    def __init__(self, status_code, content=b"", headers=None, wire=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.raw = FakeRawStream(content if wire is None else wire)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+@pytest.fixture
+def fake_response():
+    return FakeResponse
+
+
 @pytest.fixture
 def mcp():
     class MockMCP:
         def __init__(self):
             self._tools = {}
+            self._resources = {}
+            self._mcp_server = MockLowLevelServer()
         def tool(self, name=None, **kwargs):
             def decorator(fn):
                 tool_name = name or fn.__name__
                 self._tools[tool_name] = fn
                 return fn
             return decorator
+        def resource(self, uri, **kwargs):
+            def decorator(fn):
+                self._resources[uri] = fn
+                return fn
+            return decorator
         def call_tool(self, name, arguments):
             fn = self._tools[name]
             return fn(**arguments)
@@ -0,0 +1,122 @@
+import pytest
+import requests
+
+from pythonanywhere_mcp_server import breaker as breaker_module
+from pythonanywhere_mcp_server.breaker import CircuitBreaker, CircuitOpenError, endpoint_for, guard, timeout_for
+
+FILES_URL = "https://www.pythonanywhere.com/api/v0/user/alice/files/path/home/alice/a.txt"
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    fresh = {name: CircuitBreaker(name, threshold=2, reset_timeout=30) for name in breaker_module.ENDPOINTS}
+    monkeypatch.setattr(breaker_module, "breakers", fresh)
+    return fresh
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [1000.0]
+    mocker.patch("pythonanywhere_mcp_server.breaker.time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize("url, endpoint", [
+    (FILES_URL, "files"),
+    ("https://eu.pythonanywhere.com/api/v0/user/alice/webapps/alice.eu.pythonanywhere.com/reload/", "webapps"),
+    ("https://www.pythonanywhere.com/api/v1/user/alice/websites/", "websites"),
+    ("https://www.pythonanywhere.com/api/v0/user/alice/schedule/12/", "schedule"),
+    ("https://www.pythonanywhere.com/api/v0/user/alice/cpu/", None),
+])
+def test_endpoint_for(url, endpoint):
+    assert endpoint_for(url) == endpoint
+
+
+def test_timeout_for(monkeypatch):
+    assert timeout_for("files") == 60.0
+    monkeypatch.setenv("PYTHONANYWHERE_TIMEOUT", "20")
+    monkeypatch.setenv("PYTHONANYWHERE_TIMEOUT_FILES", "5")
+    assert timeout_for("files") == 5.0
+    assert timeout_for("webapps") == 20.0
+    assert timeout_for(None) == 20.0
+
+
+def test_guard_passes_timeout(mocker, breakers, fake_response):
+    request = mocker.Mock(return_value=fake_response(200))
+    guard(request)(method="GET", url=FILES_URL, headers={"a": "b"})
+    request.assert_called_once_with("GET", FILES_URL, headers={"a": "b"}, timeout=60.0)
+
+
+def test_guard_keeps_explicit_timeout(mocker, breakers, fake_response):
+    request = mocker.Mock(return_value=fake_response(200))
+    guard(request)("GET", FILES_URL, timeout=3)
+    assert request.call_args.kwargs["timeout"] == 3
+
+
+def test_breaker_trips_and_fails_fast(mocker, breakers, clock, fake_response):
+    request = mocker.Mock(side_effect=[requests.Timeout(), fake_response(503)])
+    guarded = guard(request)
+    with pytest.raises(requests.Timeout):
+        guarded("GET", FILES_URL)
+    assert guarded("GET", FILES_URL).status_code == 503
+    with pytest.raises(CircuitOpenError, match=r"files API is failing \(HTTP 503\); not calling it again for 30s"):
+        guarded("GET", FILES_URL)
+    assert request.call_count == 2
+    assert breakers["files"].stats() | {"timeout_seconds": None} == {
+        "state": "open", "consecutive_failures": 2, "trips": 1, "rejected": 1,
+        "last_error": "HTTP 503", "timeout_seconds": None,
+    }
+
+
+def test_breakers_are_per_endpoint(mocker, breakers, fake_response):
+    request = mocker.Mock(return_value=fake_response(500))
+    guarded = guard(request)
+    guarded("GET", FILES_URL)
+    guarded("GET", FILES_URL)
+    guarded("GET", "https://www.pythonanywhere.com/api/v0/user/alice/schedule/")
+    assert breakers["files"].stats()["state"] == "open"
+    assert breakers["schedule"].stats()["state"] == "closed"
+
+
+def test_client_errors_do_not_count(mocker, breakers, fake_response):
+    request = mocker.Mock(return_value=fake_response(404))
+    guarded = guard(request)
+    for _ in range(3):
+        guarded("GET", FILES_URL)
+    assert breakers["files"].stats()["consecutive_failures"] == 0
+
+
+def test_half_open_probe_closes_on_success(mocker, breakers, clock, fake_response):
+    request = mocker.Mock(return_value=fake_response(500))
+    guarded = guard(request)
+    guarded("GET", FILES_URL)
+    guarded("GET", FILES_URL)
+    clock[0] += 30
+    request.return_value = fake_response(200)
+    assert guarded("GET", FILES_URL).status_code == 200
+    assert breakers["files"].stats()["state"] == "closed"
+
+
+def test_half_open_probe_reopens_on_failure(mocker, breakers, clock, fake_response):
+    request = mocker.Mock(return_value=fake_response(500))
+    guarded = guard(request)
+    guarded("GET", FILES_URL)
+    guarded("GET", FILES_URL)
+    clock[0] += 30
+    guarded("GET", FILES_URL)
+    assert breakers["files"].stats()["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        guarded("GET", FILES_URL)
+
+
+def test_half_open_lets_one_probe_through(breakers, clock):
+    breaker = breakers["files"]
+    breaker.record_failure("ConnectionError")
+    breaker.record_failure("ConnectionError")
+    clock[0] += 30
+    breaker.before()
+    assert breaker.stats()["state"] == "half-open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+    breaker.release()
+    breaker.before()
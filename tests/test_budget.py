@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult
+
+from pythonanywhere_mcp_server import budget
+
+
+def test_fit_within_budget_is_unchanged():
+    assert budget.fit("short", 100) == "short"
+    assert budget.fit(["/a", "/b"], 100) == ["/a", "/b"]
+    assert budget.fit({"key": "x" * 1000}, 10) == {"key": "x" * 1000}
+
+
+def test_fit_zero_budget_disables_limit():
+    assert budget.fit("x" * 1000, 0) == "x" * 1000
+
+
+@pytest.fixture
+def no_note_allowance(monkeypatch):
+    monkeypatch.setattr(budget, "NOTE_ALLOWANCE", 0)
+
+
+def test_fit_truncates_text_with_continuation(no_note_allowance):
+    # "abcd" is sent as {"type":"text","text":"abcd"} and again as "abcd": 37 bytes with separators.
+    result = budget.fit("abcdefghij", 37)
+    assert result.startswith("abcd\n\n[Truncated to the 37-byte response budget: showing characters 1-4 of 10.")
+    handle = result.split("handle '")[1].split("'")[0]
+    assert budget.fit("abcdefghij", 37, 4, handle).startswith("efgh\n\n[")
+    assert budget.fit("abcdefghij", 37, 8, handle) == "ij"
+
+
+def test_fit_truncates_list_of_strings_with_string_note(no_note_allowance):
+    paths = [f"/home/u/file{i}.txt" for i in range(100)]
+    result = budget.fit(paths, 200)
+    assert result[:-1] == paths[:len(result) - 1]
+    assert result[-1].startswith(f"[Truncated to the 200-byte response budget: showing items 1-{len(result) - 1} of 100.")
+
+
+def test_fit_truncates_list_of_dicts_with_dict_note(no_note_allowance):
+    apps = [{"domain_name": f"app{i}.example.com"} for i in range(50)]
+    result = budget.fit(apps, 200)
+    note = result[-1]
+    assert note["truncated"] is True
+    assert note["total"] == 50
+    assert note["next_offset"] == note["returned"] == len(result) - 1
+
+
+def test_fit_always_makes_progress():
+    assert budget.fit(["x" * 100, "y"], 10)[0] == "x" * 100
+
+
+def test_budget_for(monkeypatch):
+    monkeypatch.delenv("PYTHONANYWHERE_RESPONSE_BUDGET", raising=False)
+    assert budget.budget_for("tree") == budget.DEFAULT_BUDGET
+    monkeypatch.setenv("PYTHONANYWHERE_RESPONSE_BUDGET", "5000")
+    monkeypatch.setenv("PYTHONANYWHERE_RESPONSE_BUDGET_TREE", "100")
+    assert budget.budget_for("tree") == 100
+    assert budget.budget_for("list_webapps") == 5000
+
+
+def test_store_is_capped_by_total_size(monkeypatch):
+    monkeypatch.setattr(budget, "_stored", budget.OrderedDict())
+    monkeypatch.setattr(budget, "_stored_bytes", 0)
+    monkeypatch.setattr(budget, "MAX_STORED_BYTES", 250)
+    first = budget._store("x" * 100, 10)
+    second = budget._store("y" * 100, 10)
+    assert list(budget._stored) == [first, second]
+    third = budget._store("z" * 100, 10)
+    assert list(budget._stored) == [second, third]
+    assert budget._stored_bytes == 204
+    assert budget._store("w" * 300, 10) is None
+    assert "too large to keep" in budget.fit("w" * 3000, 1500)
+
+
+def test_apply_response_budget_measures_what_is_sent(monkeypatch):
+    monkeypatch.setenv("PYTHONANYWHERE_RESPONSE_BUDGET_TREE", "20000")
+    monkeypatch.setenv("PYTHONANYWHERE_RESPONSE_BUDGET_LIST_APPS", "20000")
+    monkeypatch.setenv("PYTHONANYWHERE_RESPONSE_BUDGET_CAT", "20000")
+    mcp = FastMCP("test")
+    budget.apply_response_budget(mcp)
+
+    @mcp.tool()
+    def tree() -> list[str]:
+        """List paths."""
+        return [f"/home/u/\u00e9t\u00e9/\"{i}\".txt" for i in range(5000)]
+
+    @mcp.tool()
+    def list_apps() -> list[dict]:
+        """List apps."""
+        return [{"domain_name": f"app{i}.example.com", "enabled": True} for i in range(5000)]
+
+    @mcp.tool()
+    def cat() -> str:
+        """Print text."""
+        return "line\t\"\u00e9\"\n" * 10000
+
+    for name in ("tree", "list_apps", "cat"):
+        content, structured = asyncio.run(mcp.call_tool(name, {}))
+        sent = CallToolResult(content=content, structuredContent=structured).model_dump_json(by_alias=True, exclude_none=True)
+        assert 15000 < len(sent.encode()) <= 20000
+        assert "Truncated to the 20000-byte response budget" in sent
+
+
+def test_apply_response_budget(monkeypatch):
+    monkeypatch.setenv("PYTHONANYWHERE_RESPONSE_BUDGET_TREE", "1200")
+    mcp = FastMCP("test")
+    budget.apply_response_budget(mcp)
+
+    @mcp.tool()
+    def tree(path: str) -> list[str]:
+        """List paths."""
+        return [f"{path}/{i}" for i in range(100)]
+
+    async def call(name, arguments):
+        return (await mcp.call_tool(name, arguments))[1]["result"]
+
+    first = asyncio.run(call("tree", {"path": "/a"}))
+    assert first[:3] == ["/a/0", "/a/1", "/a/2"]
+    handle = first[-1].split("handle '")[1].split("'")[0]
+    offset = int(first[-1].split("offset ")[1].split(" ")[0])
+    assert offset == len(first) - 1
+    second = asyncio.run(call("continue_result", {"handle": handle, "offset": offset}))
+    assert second[0] == f"/a/{offset}"
+    assert tree("/b") == [f"/b/{i}" for i in range(100)]
+
+
+def test_continue_result_unknown_handle():
+    mcp = FastMCP("test")
+    budget.apply_response_budget(mcp)
+    with pytest.raises(Exception) as exc:
+        asyncio.run(mcp.call_tool("continue_result", {"handle": "nope", "offset": 0}))
+    assert "No stored result for handle 'nope'" in str(exc.value)
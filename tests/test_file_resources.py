@@ -0,0 +1,107 @@
+import pytest
+
+import resources.file as file_resources
+
+
+class FakeSession:
+    def __init__(self):
+        self.updated = []
+
+    async def send_resource_updated(self, uri):
+        self.updated.append(str(uri))
+
+
+def test_file_uri_round_trip():
+    uri = file_resources.file_uri("/home/alice/my app/main.py")
+    assert uri == "pythonanywhere://files/%2Fhome%2Falice%2Fmy%20app%2Fmain.py"
+    assert file_resources.path_from_uri(uri) == "/home/alice/my app/main.py"
+
+
+def test_path_from_uri_rejects_other_uris():
+    with pytest.raises(ValueError):
+        file_resources.path_from_uri("file:///etc/passwd")
+
+
+@pytest.mark.parametrize("data,expected", [
+    (b"print('hi')", "print('hi')"),
+    (b"\x89PNG\xff", b"\x89PNG\xff"),
+    ({"a.py": {"type": "file"}}, '{"a.py": {"type": "file"}}'),
+])
+def test_read_file_resource(mcp, mocker, data, expected):
+    file_resources.register_file_resources(mcp)
+    mock_files = mocker.patch("resources.file.Files", autospec=True)
+    mock_files.return_value.path_get.return_value = data
+    result = mcp._resources["pythonanywhere://files/{path}"]("%2Fhome%2Falice%2Fa.py")
+    mock_files.return_value.path_get.assert_called_with("/home/alice/a.py")
+    assert result == expected
+
+
+def test_register_file_resources_advertises_subscriptions(mcp):
+    file_resources.register_file_resources(mcp)
+    capabilities = mcp._mcp_server.get_capabilities(None, {})
+    assert capabilities.resources.subscribe is True
+    assert {"subscribe", "unsubscribe"} <= set(mcp._mcp_server.request_handlers)
+
+
+def test_fingerprint_checks_files_with_head(mocker, fake_response):
+    mock_call_api = mocker.patch(
+        "resources.file.call_api", return_value=fake_response(200, headers={"ETag": '"v1"', "Content-Length": "4"}),
+    )
+    assert file_resources.fingerprint("/home/alice/a.py") == '["\\"v1\\"", null, "4"]'
+    mock_call_api.assert_called_once_with(
+        f"{file_resources.Files.path_endpoint}/home/alice/a.py", "HEAD", headers={"Accept-Encoding": "identity"},
+    )
+
+
+def test_fingerprint_never_downloads_files_without_validators(mocker, fake_response):
+    mock_call_api = mocker.patch(
+        "resources.file.call_api",
+        side_effect=[fake_response(200, headers={"Content-Length": "4"}), fake_response(200, headers={"Content-Length": "5"})],
+    )
+    assert file_resources.fingerprint("/home/alice/a.py") != file_resources.fingerprint("/home/alice/a.py")
+    assert [c.args[1] for c in mock_call_api.call_args_list] == ["HEAD", "HEAD"]
+
+
+def test_fingerprint_hashes_directory_listings(mocker, fake_response):
+    json_type = {"content-type": "application/json"}
+    mock_call_api = mocker.patch("resources.file.call_api", side_effect=[
+        fake_response(200, headers=json_type),
+        fake_response(200, b'{"a": 1}', json_type),
+        fake_response(200, headers=json_type),
+        fake_response(200, b'{"a": 1, "b": 2}', json_type),
+    ])
+    assert file_resources.fingerprint("/home/alice/") != file_resources.fingerprint("/home/alice/")
+    assert [c.args[1] for c in mock_call_api.call_args_list] == ["HEAD", "GET", "HEAD", "GET"]
+
+
+@pytest.mark.anyio
+async def test_watcher_notifies_only_on_change(mocker):
+    fingerprints = iter(["v1", "v1", "v2"])
+    mocker.patch("resources.file.fingerprint", side_effect=lambda path: next(fingerprints))
+    watcher = file_resources.FileWatcher(interval=3600)
+    session = FakeSession()
+    uri = file_resources.file_uri("/home/alice/a.py")
+
+    await watcher.subscribe(uri, session)
+    await watcher.check()
+    assert session.updated == []
+    await watcher.check()
+    assert session.updated == [uri]
+
+    await watcher.unsubscribe(uri, session)
+    watcher._task.cancel()
+
+
+@pytest.mark.anyio
+async def test_watcher_forgets_closed_sessions(mocker):
+    fingerprints = iter(["v1", "v2"])
+    mocker.patch("resources.file.fingerprint", side_effect=lambda path: next(fingerprints))
+    watcher = file_resources.FileWatcher(interval=3600)
+    session = FakeSession()
+    session.send_resource_updated = mocker.AsyncMock(side_effect=Exception("closed"))
+    uri = file_resources.file_uri("/home/alice/a.py")
+
+    await watcher.subscribe(uri, session)
+    await watcher.check()
+    assert watcher._subscribers == {}
+    watcher._task.cancel()
@@ -1,20 +1,48 @@
+import gzip
+import hashlib
+import io
+import json
+import tarfile
+import threading
+import time
+
+import anyio
 import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import CancelledNotification, CancelledNotificationParams, ClientNotification
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
 
 import tools.file as file_tools
+from pythonanywhere_mcp_server.progress import Cancelled, current_cancel
+from pythonanywhere_mcp_server.server import run_sync_tools_in_threads
 
 
-def test_read_file_or_directory_file(mcp, mocker):
+def test_read_file_or_directory_file(mcp, mocker, fake_response):
     file_tools.register_file_tools(mcp)
-    mock_files = mocker.patch("tools.file.Files", autospec=True)
-    mock_files.return_value.path_get.return_value = b"file contents"
+    mock_call_api = mocker.patch("tools.file.call_api", return_value=fake_response(200, b"file contents"))
     result = mcp.call_tool("read_file_or_directory", {"path": "/some/file.txt"})
+    assert mock_call_api.call_args.args[0].endswith("/files/path/some/file.txt")
     assert result == "file contents"
 
 
-def test_read_file_or_directory_directory(mcp, mocker):
+def test_read_file_or_directory_reports_compression(mcp, mocker, fake_response):
     file_tools.register_file_tools(mcp)
-    mock_files = mocker.patch("tools.file.Files", autospec=True)
-    mock_files.return_value.path_get.return_value = {"listing": ["a", "b"]}
+    content = b"line of a log file\n" * 1000
+    wire = gzip.compress(content)
+    mocker.patch("tools.file.call_api", return_value=fake_response(200, headers={"Content-Encoding": "gzip"}, wire=wire))
+    result = mcp.call_tool("read_file_or_directory", {"path": "/some/file.log"})
+    assert result == (
+        f"{content.decode()}\n\n[Transferred {len(wire)} B for 18.6 KB of content"
+        f" (compression ratio {len(content) / len(wire):.1f}x).]"
+    )
+
+
+def test_read_file_or_directory_directory(mcp, mocker, fake_response):
+    file_tools.register_file_tools(mcp)
+    listing = fake_response(200, json.dumps({"listing": ["a", "b"]}).encode(), {"Content-Type": "application/json"})
+    mocker.patch("tools.file.call_api", return_value=listing)
     result = mcp.call_tool("read_file_or_directory", {"path": "/some/dir/"})
     assert result == str({"listing": ["a", "b"]})
 
@@ -27,6 +55,87 @@ def test_upload_text_file(mcp, mocker):
     assert result == "Uploaded to /some/file.txt (HTTP 201)."
 
 
+@pytest.fixture
+def written(mocker):
+    return mocker.patch.object(file_tools, "_written", {})
+
+
+def test_upload_text_files(mcp, mocker, written):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_post.return_value = 201
+    result = mcp.call_tool("upload_text_files", {"files": [
+        {"path": "/a/one.py", "content": "one"},
+        {"path": "/a/two.py", "content": "two"},
+    ]})
+    assert sorted(c.args for c in mock_files.return_value.path_post.call_args_list) == [
+        ("/a/one.py", b"one"), ("/a/two.py", b"two"),
+    ]
+    assert result == {"/a/one.py": "Uploaded to /a/one.py (HTTP 201).", "/a/two.py": "Uploaded to /a/two.py (HTTP 201)."}
+
+
+def test_upload_text_files_skips_unchanged(mcp, mocker, written):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_post.return_value = 200
+    mcp.call_tool("upload_text_file", {"dest_path": "/a/one.py", "content": "one"})
+    mcp.call_tool("upload_text_files", {"files": [{"path": "/a/two.py", "content": "two"}]})
+    mock_files.return_value.path_post.reset_mock()
+
+    result = mcp.call_tool("upload_text_files", {"files": [
+        {"path": "/a/one.py", "content": "one"},
+        {"path": "/a/two.py", "content": "two, edited"},
+        {"path": "/a/three.py", "content": "three"},
+    ]})
+    assert sorted(c.args[0] for c in mock_files.return_value.path_post.call_args_list) == ["/a/three.py", "/a/two.py"]
+    assert result["/a/one.py"] == "Unchanged since last upload; skipped."
+
+    mock_files.return_value.path_post.reset_mock()
+    mcp.call_tool("upload_text_files", {"files": [{"path": "/a/one.py", "content": "one"}], "force": True})
+    mock_files.return_value.path_post.assert_called_once_with("/a/one.py", b"one")
+
+
+def test_upload_text_files_uploads_again_after_delete(mcp, mocker, written):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    files = [{"path": "/a/b/one.py", "content": "one"}, {"path": "/a/two.py", "content": "two"}]
+    mcp.call_tool("upload_text_files", {"files": files})
+    mcp.call_tool("delete_path", {"path": "/a/b"})
+    mock_files.return_value.path_post.reset_mock()
+    mcp.call_tool("upload_text_files", {"files": files})
+    mock_files.return_value.path_post.assert_called_once_with("/a/b/one.py", b"one")
+
+
+def test_upload_text_files_reports_per_file_errors(mcp, mocker, written):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_post.side_effect = lambda path, data: 1 / 0 if path == "/a/bad.py" else 201
+    files = [{"path": "/a/bad.py", "content": "x"}, {"path": "/a/good.py", "content": "y"}]
+    result = mcp.call_tool("upload_text_files", {"files": files})
+    assert result == {
+        "/a/bad.py": "Failed to upload text file: division by zero",
+        "/a/good.py": "Uploaded to /a/good.py (HTTP 201).",
+    }
+    mock_files.return_value.path_post.reset_mock()
+    mcp.call_tool("upload_text_files", {"files": files})
+    mock_files.return_value.path_post.assert_called_once_with("/a/bad.py", b"x")
+
+
+def test_upload_text_files_rejects_malformed_files(mcp, mocker, written):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    with pytest.raises(RuntimeError, match="each file must be a dictionary with 'path' and 'content'"):
+        mcp.call_tool("upload_text_files", {"files": [{"path": "/a/one.py"}]})
+
+
+def test_upload_text_files_manifest(mcp, mocker, written, tmp_path):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    manifest = tmp_path / "manifest.json"
+    mcp.call_tool("upload_text_files", {"files": [{"path": "/a/one.py", "content": "one"}], "manifest_path": str(manifest)})
+    assert json.loads(manifest.read_text())["files"]["/a/one.py"] == {"size": 3, "sha256": hashlib.sha256(b"one").hexdigest()}
+
+
 def test_delete_path(mcp, mocker):
     file_tools.register_file_tools(mcp)
     mock_files = mocker.patch("tools.file.Files", autospec=True)
@@ -37,13 +146,19 @@ def test_delete_path(mcp, mocker):
 
 def test_read_file_or_directory_file_exception(mcp, mocker):
     file_tools.register_file_tools(mcp)
-    mock_files = mocker.patch("tools.file.Files", autospec=True)
-    mock_files.return_value.path_get.side_effect = Exception("read error")
+    mocker.patch("tools.file.call_api", side_effect=Exception("read error"))
     with pytest.raises(RuntimeError) as exc:
         mcp.call_tool("read_file_or_directory", {"path": "/some/file.txt"})
     assert "Failed to read file or directory: read error" in str(exc)
 
 
+def test_read_file_or_directory_missing(mcp, mocker, fake_response):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.call_api", return_value=fake_response(404))
+    with pytest.raises(RuntimeError, match="GET to fetch contents of /some/file.txt failed"):
+        mcp.call_tool("read_file_or_directory", {"path": "/some/file.txt"})
+
+
 def test_upload_text_file_exception(mcp, mocker):
     file_tools.register_file_tools(mcp)
     mock_files = mocker.patch("tools.file.Files", autospec=True)
@@ -62,35 +177,628 @@ def test_delete_path_exception(mcp, mocker):
     assert "Failed to delete path: delete error" in str(exc)
 
 
-def test_upload_directory(mcp, mocker):
+def test_directory_tree(mcp, mocker):
     file_tools.register_file_tools(mcp)
     mock_files = mocker.patch("tools.file.Files", autospec=True)
-    result = mcp.call_tool("upload_directory", {"local_dir_path": "/local/myapp", "remote_dir_path": "/home/user/myapp"})
-    mock_files.return_value.tree_post.assert_called_with("/local/myapp", "/home/user/myapp")
-    assert result == "Uploaded /local/myapp to /home/user/myapp."
+    mock_files.return_value.tree_get.return_value = ["/a", "/b/c"]
+    result = mcp.call_tool("tree", {"path": "/some/dir/"})
+    assert result == ["/a", "/b/c"]
 
 
-def test_upload_directory_exception(mcp, mocker):
+def test_directory_tree_exception(mcp, mocker):
     file_tools.register_file_tools(mcp)
     mock_files = mocker.patch("tools.file.Files", autospec=True)
-    mock_files.return_value.tree_post.side_effect = Exception("upload dir error")
+    mock_files.return_value.tree_get.side_effect = Exception("tree error")
     with pytest.raises(RuntimeError) as exc:
-        mcp.call_tool("upload_directory", {"local_dir_path": "/local/myapp", "remote_dir_path": "/home/user/myapp"})
-    assert "Failed to upload directory: upload dir error" in str(exc)
+        mcp.call_tool("tree", {"path": "/some/dir/"})
+    assert "Failed to get directory tree: tree error" in str(exc)
 
 
-def test_directory_tree(mcp, mocker):
+def test_delete_paths(mcp, mocker):
     file_tools.register_file_tools(mcp)
     mock_files = mocker.patch("tools.file.Files", autospec=True)
-    mock_files.return_value.tree_get.return_value = ["/a", "/b/c"]
-    result = mcp.call_tool("tree", {"path": "/some/dir/"})
-    assert result == ["/a", "/b/c"]
+    result = mcp.call_tool("delete_paths", {"paths": ["/a/one.txt", "/a/two.txt"]})
+    assert sorted(c.args[0] for c in mock_files.return_value.path_delete.call_args_list) == ["/a/one.txt", "/a/two.txt"]
+    assert result == {"/a/one.txt": "Deleted /a/one.txt.", "/a/two.txt": "Deleted /a/two.txt."}
 
 
-def test_directory_tree_exception(mcp, mocker):
+def test_delete_paths_reports_progress(mcp, mocker):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    progress = mocker.patch("tools.file.Progress", autospec=True).return_value
+    mcp.call_tool("delete_paths", {"paths": ["/a/one.txt", "/a/two.txt"]})
+    progress.report.assert_called_with(2, 2, "Deleted 2 of 2 paths", force=True)
+
+
+def test_delete_paths_folds_children_into_parent(mcp, mocker):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    result = mcp.call_tool("delete_paths", {"paths": ["/a/b/c.txt", "/a/b/", "/a-b/d.txt"]})
+    assert sorted(c.args[0] for c in mock_files.return_value.path_delete.call_args_list) == ["/a-b/d.txt", "/a/b/"]
+    assert result["/a/b/c.txt"] == "Deleted with /a/b/."
+
+
+def test_delete_paths_with_pattern(mcp, mocker):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = [
+        "/home/u/logs/", "/home/u/logs/a.log", "/home/u/logs/old/b.log", "/home/u/app.py",
+    ]
+    result = mcp.call_tool("delete_paths", {"root": "/home/u", "pattern": "**/*.log"})
+    mock_files.return_value.tree_get.assert_called_with("/home/u")
+    assert sorted(result) == ["/home/u/logs/a.log", "/home/u/logs/old/b.log"]
+
+
+def test_delete_paths_pattern_never_matches_root(mcp, mocker):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/tmp/", "/home/u/tmp/a.txt", "/home/u/tmp/cache/"]
+    result = mcp.call_tool("delete_paths", {"root": "/home/u/tmp", "pattern": "**"})
+    assert sorted(c.args[0] for c in mock_files.return_value.path_delete.call_args_list) == [
+        "/home/u/tmp/a.txt", "/home/u/tmp/cache/",
+    ]
+    assert "/home/u/tmp/" not in result
+
+
+def test_delete_paths_reports_per_path_errors(mcp, mocker):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+
+    def path_delete(path):
+        if path == "/b":
+            raise Exception("nope")
+        return 204
+
+    mock_files.return_value.path_delete.side_effect = path_delete
+    result = mcp.call_tool("delete_paths", {"paths": ["/a", "/b", "/b/c"]})
+    assert result == {"/a": "Deleted /a.", "/b": "Failed to delete path: nope", "/b/c": "Failed to delete path: nope"}
+
+
+def test_delete_paths_pattern_without_root(mcp, mocker):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    with pytest.raises(RuntimeError) as exc:
+        mcp.call_tool("delete_paths", {"pattern": "*.log"})
+    assert "`root` is required" in str(exc)
+
+
+def test_download_directory(mcp, mocker, tmp_path, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/", "/home/u/app/static/", "/home/u/app/static/logo.png", "/home/u/app/empty/"]
+    mock_call_api = mocker.patch("tools.file.call_api", return_value=fake_response(200, b"\x89PNG\xff", {"ETag": '"v1"'}))
+
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+
+    assert mock_call_api.call_args.args[0].endswith("/home/u/app/static/logo.png")
+    assert (tmp_path / "static" / "logo.png").read_bytes() == b"\x89PNG\xff"
+    assert (tmp_path / "empty").is_dir()
+    assert result == (
+        f"Downloaded /home/u/app to {tmp_path}: 1 downloaded, 0 resumed, 0 unchanged, 0 failed."
+        " Transferred 5 B for 5 B of content (compression ratio 1.0x)."
+    )
+
+
+def test_download_directory_warns_when_listing_is_capped(mcp, mocker, tmp_path, fake_response):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.TREE_LIMIT", 2)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/a.txt"]
+    mocker.patch("tools.file.call_api", return_value=fake_response(200, b"hello"))
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+    assert "Warning" not in result
+
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/a.txt", "/home/u/app/b.txt"]
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+    assert "Warning: the remote listing reached its limit of 2 entries" in result
+
+
+def test_download_directory_skips_unchanged_files(mcp, mocker, tmp_path, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/a.txt"]
+    mock_call_api = mocker.patch("tools.file.call_api", return_value=fake_response(200, b"hello", {"ETag": '"v1"'}))
+    mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+
+    mock_call_api.return_value = fake_response(304)
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+
+    assert mock_call_api.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert "0 downloaded, 0 resumed, 1 unchanged, 0 failed." in result
+
+
+def test_download_directory_reports_compression(mcp, mocker, tmp_path, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/data.json"]
+    content = b'{"key": "value"}\n' * 4096
+    wire = gzip.compress(content)
+    mocker.patch("tools.file.call_api", return_value=fake_response(200, b"", {"Content-Encoding": "gzip"}, wire=wire))
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+    assert (tmp_path / "data.json").read_bytes() == content
+    assert result.endswith(
+        f"Transferred {len(wire)} B for 68.0 KB of content (compression ratio {len(content) / len(wire):.1f}x)."
+    )
+
+
+def test_download_directory_resumes_partial_files(mcp, mocker, tmp_path, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/a.bin"]
+    (tmp_path / "a.bin.part").write_bytes(b"hel")
+    (tmp_path / file_tools.DOWNLOAD_MANIFEST).write_text('{"a.bin": {"etag": "\\"v1\\"", "partial": true}}')
+    mock_call_api = mocker.patch("tools.file.call_api", return_value=fake_response(206, b"lo", {"ETag": '"v1"'}))
+
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+
+    assert mock_call_api.call_args.kwargs["headers"] == {"Accept-Encoding": "identity", "Range": "bytes=3-", "If-Range": '"v1"'}
+    assert (tmp_path / "a.bin").read_bytes() == b"hello"
+    assert not (tmp_path / "a.bin.part").exists()
+    assert "0 downloaded, 1 resumed, 0 unchanged, 0 failed." in result
+
+
+def test_download_directory_reports_failed_files(mcp, mocker, tmp_path, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/app/a.txt"]
+    mocker.patch("tools.file.call_api", return_value=fake_response(404))
+    result = mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+    assert "1 failed." in result
+    assert "/home/u/app/a.txt: GET to fetch contents of /home/u/app/a.txt failed" in result
+
+
+def test_download_directory_exception(mcp, mocker, tmp_path):
     file_tools.register_file_tools(mcp)
     mock_files = mocker.patch("tools.file.Files", autospec=True)
     mock_files.return_value.tree_get.side_effect = Exception("tree error")
     with pytest.raises(RuntimeError) as exc:
-        mcp.call_tool("tree", {"path": "/some/dir/"})
-    assert "Failed to get directory tree: tree error" in str(exc)
+        mcp.call_tool("download_directory", {"remote_dir_path": "/home/u/app", "local_dir_path": str(tmp_path)})
+    assert "Failed to download directory: tree error" in str(exc)
+
+
+@pytest.fixture
+def search_tools(mcp, mocker, fake_response):
+    file_tools.register_file_tools(mcp)
+    mocker.patch.object(file_tools, "_search_cache", file_tools.OrderedDict())
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = [
+        "/home/u/app/", "/home/u/app/settings.py", "/home/u/app/README.md", "/home/u/app/logo.png",
+    ]
+    contents = {
+        "/home/u/app/settings.py": b"import os\nDEBUG = True\nSECRET = 'x'\nALLOWED = []\n",
+        "/home/u/app/README.md": b"Set DEBUG in settings\n",
+        "/home/u/app/logo.png": b"\x89PNG\x00DEBUG",
+    }
+
+    def call_api(url, method, **kwargs):
+        path = next(path for path in contents if url.endswith(path))
+        return fake_response(200, contents[path], {"ETag": f'"{path}"'})
+
+    return mcp, mocker.patch("tools.file.call_api", side_effect=call_api)
+
+
+def test_search_files(search_tools):
+    mcp, _ = search_tools
+    result = mcp.call_tool("search_files", {"root": "/home/u/app", "regex": "DEBUG"})
+    assert result == "/home/u/app/README.md:1:Set DEBUG in settings\n/home/u/app/settings.py:2:DEBUG = True"
+
+
+def test_search_files_with_include_and_context(search_tools):
+    mcp, mock_call_api = search_tools
+    result = mcp.call_tool("search_files", {"root": "/home/u/app", "regex": "^DEBUG", "include": ["*.py"], "context_lines": 1})
+    assert mock_call_api.call_count == 1
+    assert result == (
+        "/home/u/app/settings.py-1-import os\n"
+        "/home/u/app/settings.py:2:DEBUG = True\n"
+        "/home/u/app/settings.py-3-SECRET = 'x'"
+    )
+
+
+def test_search_files_reuses_unchanged_contents(search_tools, fake_response):
+    mcp, mock_call_api = search_tools
+    mcp.call_tool("search_files", {"root": "/home/u/app", "regex": "DEBUG", "include": ["*.py"]})
+    mock_call_api.side_effect = None
+    mock_call_api.return_value = fake_response(304)
+    result = mcp.call_tool("search_files", {"root": "/home/u/app", "regex": "SECRET", "include": ["*.py"]})
+    assert mock_call_api.call_args.kwargs["headers"] == {"If-None-Match": '"/home/u/app/settings.py"'}
+    assert result == "/home/u/app/settings.py:3:SECRET = 'x'"
+
+
+def test_search_files_no_matches(search_tools):
+    mcp, _ = search_tools
+    result = mcp.call_tool("search_files", {"root": "/home/u/app", "regex": "nothing here"})
+    assert result == "No matches for 'nothing here' in 3 files under /home/u/app."
+
+
+def test_search_files_limits_results(search_tools):
+    mcp, _ = search_tools
+    result = mcp.call_tool("search_files", {"root": "/home/u/app", "regex": ".", "max_results": 2})
+    assert result.splitlines()[-1] == "... 3 more lines omitted; narrow `include` or `regex`."
+
+
+def test_search_files_invalid_regex(search_tools):
+    mcp, _ = search_tools
+    with pytest.raises(RuntimeError) as exc:
+        mcp.call_tool("search_files", {"root": "/home/u/app", "regex": "("})
+    assert "Failed to search files" in str(exc)
+
+
+@pytest.fixture
+def local_tree(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('hi')")
+    (tmp_path / "app" / "__pycache__").mkdir()
+    (tmp_path / "app" / "__pycache__" / "main.cpython-313.pyc").write_bytes(b"\x00")
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "README.md").write_text("readme")
+    return tmp_path
+
+
+def test_upload_directory(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    result = mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site/"})
+    assert sorted(c.args for c in mock_files.return_value.path_post.call_args_list) == [
+        ("/home/u/site/README.md", b"readme"),
+        ("/home/u/site/app/main.py", b"print('hi')"),
+        ("/home/u/site/empty/.empty", b""),
+    ]
+    mock_files.return_value.path_delete.assert_called_once_with("/home/u/site/empty/.empty")
+    assert result == f"Uploaded {local_tree} to /home/u/site/: 2 files, 17 B."
+
+
+def test_upload_directory_with_empty_ignore_uploads_everything(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    result = mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "ignore": []})
+    assert ("/home/u/site/app/__pycache__/main.cpython-313.pyc", b"\x00") in [
+        c.args for c in mock_files.return_value.path_post.call_args_list
+    ]
+    assert result == f"Uploaded {local_tree} to /home/u/site: 3 files, 18 B."
+
+
+def test_upload_directory_reports_progress(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    progress = mocker.patch("tools.file.Progress", autospec=True).return_value
+    mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site"})
+    assert {c.args[0] for c in progress.report.call_args_list} >= {1, 2}
+    progress.report.assert_called_with(2, 2, "Uploaded 2 files (17 B)", force=True)
+
+
+def test_upload_directory_exception(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_post.side_effect = Exception("upload dir error")
+    with pytest.raises(RuntimeError, match="Failed to upload directory: upload dir error"):
+        mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site"})
+
+
+def test_upload_directory_not_a_directory(mcp, mocker, tmp_path):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    with pytest.raises(RuntimeError, match="is not a directory"):
+        mcp.call_tool("upload_directory", {"local_dir_path": str(tmp_path / "missing"), "remote_dir_path": "/home/u/site"})
+
+
+def test_upload_directory_bounds_buffered_contents(mcp, mocker, tmp_path):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mocker.patch.object(file_tools, "MAX_BUFFERED_BYTES", 10)
+    for index in range(20):
+        (tmp_path / f"{index}.txt").write_bytes(b"x" * 6)
+    in_flight = []
+    peak = []
+
+    def post(path, data):
+        in_flight.append(path)
+        peak.append(len(in_flight))
+        time.sleep(0.01)
+        in_flight.remove(path)
+
+    mock_files.return_value.path_post.side_effect = post
+    result = mcp.call_tool("upload_directory", {"local_dir_path": str(tmp_path), "remote_dir_path": "/home/u/site"})
+    assert result.endswith(": 20 files, 120 B.")
+    assert max(peak) == 2
+
+
+def test_upload_tree_hashes_only_for_manifest(mocker, local_tree):
+    mocker.patch("tools.file.Files", autospec=True)
+    sha256 = mocker.spy(file_tools.hashlib, "sha256")
+    progress = file_tools.Progress(None)
+    assert file_tools._upload_tree(local_tree, "/home/u/site", 2, progress) == (3, 18, {})
+    sha256.assert_not_called()
+    count, size, entries = file_tools._upload_tree(local_tree, "/home/u/site", 2, progress, manifest=True)
+    assert entries["/home/u/site/README.md"] == {"size": 6, "sha256": hashlib.sha256(b"readme").hexdigest()}
+
+
+def test_walk(local_tree):
+    assert sorted((str(path), is_file) for path, is_file in file_tools._walk(local_tree)) == [
+        ("README.md", True), ("app/__pycache__/main.cpython-313.pyc", True), ("app/main.py", True), ("empty", False),
+    ]
+
+
+def test_upload_directory_archive(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.time.sleep")
+    mocker.patch("tools.file.uuid.uuid4").return_value.hex = "abc"
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_get.side_effect = [PythonAnywhereApiException("404"), b"0\n"]
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.return_value = {"id": 42}
+
+    result = mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site/", "archive": True})
+
+    archive_path, content = mock_files.return_value.path_post.call_args.args
+    assert archive_path == "/home/u/site/.pythonanywhere-upload-abc.tar.gz"
+    with tarfile.open(fileobj=io.BytesIO(content)) as tar:
+        assert sorted(tar.getnames()) == ["README.md", "app", "app/main.py", "empty"]
+    command = mock_schedule.return_value.create.call_args.args[0]["command"]
+    assert "tar -xzf /home/u/site/.pythonanywhere-upload-abc.tar.gz -C /home/u/site;" in command
+    mock_schedule.return_value.delete.assert_called_once_with(42)
+    mock_files.return_value.path_delete.assert_called_once_with("/home/u/site/.pythonanywhere-upload-abc.tar.gz.status")
+    mock_files.return_value.tree_post.assert_not_called()
+    assert result.startswith(f"Uploaded {local_tree} to /home/u/site/: 2 files in one ")
+
+
+def test_upload_directory_archive_extraction_failure(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.time.sleep")
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_get.return_value = b"2\n"
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.return_value = {"id": 42}
+    with pytest.raises(RuntimeError) as exc:
+        mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "archive": True})
+    assert "failed with exit status 2" in str(exc)
+    mock_schedule.return_value.delete.assert_called_once_with(42)
+
+
+def test_upload_directory_archive_removed_when_schedule_fails(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.uuid.uuid4").return_value.hex = "abc"
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.side_effect = PythonAnywhereApiException("task limit reached")
+    with pytest.raises(RuntimeError, match="task limit reached"):
+        mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "archive": True})
+    mock_files.return_value.path_delete.assert_called_once_with("/home/u/site/.pythonanywhere-upload-abc.tar.gz")
+    mock_schedule.return_value.delete.assert_not_called()
+
+
+def test_upload_directory_archive_removed_when_polling_fails(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.time.sleep")
+    mocker.patch("tools.file.uuid.uuid4").return_value.hex = "abc"
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_get.side_effect = ConnectionError("reset")
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.return_value = {"id": 42}
+    with pytest.raises(RuntimeError, match="reset"):
+        mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "archive": True})
+    mock_files.return_value.path_delete.assert_called_once_with("/home/u/site/.pythonanywhere-upload-abc.tar.gz")
+    mock_schedule.return_value.delete.assert_called_once_with(42)
+
+
+def test_pack_hashes_files_while_packing(local_tree):
+    archive, packed = file_tools._pack(local_tree, file_tools.DEFAULT_IGNORE)
+    assert packed == {
+        "README.md": {"size": 6, "sha256": hashlib.sha256(b"readme").hexdigest()},
+        "app/main.py": {"size": 11, "sha256": hashlib.sha256(b"print('hi')").hexdigest()},
+    }
+    with archive, tarfile.open(fileobj=archive) as tar:
+        assert tar.extractfile("app/main.py").read() == b"print('hi')"
+
+
+def test_upload_directory_archive_writes_manifest_after_extraction(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.time.sleep")
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.return_value = {"id": 42}
+    manifest_path = local_tree.parent / "manifest.json"
+    arguments = {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "archive": True, "manifest_path": str(manifest_path)}
+
+    mock_files.return_value.path_get.return_value = b"2\n"
+    with pytest.raises(RuntimeError):
+        mcp.call_tool("upload_directory", arguments)
+    assert not manifest_path.exists()
+
+    mock_files.return_value.path_get.return_value = b"0\n"
+    mcp.call_tool("upload_directory", arguments)
+    assert sorted(json.loads(manifest_path.read_text())["files"]) == ["/home/u/site/README.md", "/home/u/site/app/main.py"]
+
+
+def test_upload_directory_archive_timeout(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.time.sleep")
+    mocker.patch("tools.file.ARCHIVE_TIMEOUT", -1)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_get.side_effect = PythonAnywhereApiException("404")
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.return_value = {"id": 42}
+    with pytest.raises(RuntimeError) as exc:
+        mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "archive": True})
+    assert "archive was not extracted within" in str(exc)
+    mock_schedule.return_value.delete.assert_called_once_with(42)
+    assert mock_files.return_value.path_delete.call_args.args[0].endswith(".tar.gz")
+
+
+def test_upload_text_file_writes_manifest(mcp, mocker, tmp_path):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_post.return_value = 201
+    manifest_path = tmp_path / "manifest.json"
+    mcp.call_tool("upload_text_file", {"dest_path": "/home/u/a.txt", "content": "hello", "manifest_path": str(manifest_path)})
+    mcp.call_tool("upload_text_file", {"dest_path": "/home/u/b.txt", "content": "", "manifest_path": str(manifest_path)})
+    assert json.loads(manifest_path.read_text())["files"] == {
+        "/home/u/a.txt": {"size": 5, "sha256": hashlib.sha256(b"hello").hexdigest()},
+        "/home/u/b.txt": {"size": 0, "sha256": hashlib.sha256(b"").hexdigest()},
+    }
+
+
+def test_upload_directory_writes_manifest(mcp, mocker, local_tree):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    manifest_path = local_tree.parent / "manifest.json"
+    mcp.call_tool("upload_directory", {"local_dir_path": str(local_tree), "remote_dir_path": "/home/u/site", "manifest_path": str(manifest_path)})
+    assert sorted(json.loads(manifest_path.read_text())["files"]) == [
+        "/home/u/site/README.md", "/home/u/site/app/main.py",
+    ]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps({"files": {
+        "/home/u/site/a.py": {"size": 5, "sha256": hashlib.sha256(b"hello").hexdigest()},
+        "/home/u/site/b.py": {"size": 5, "sha256": hashlib.sha256(b"world").hexdigest()},
+        "/home/u/site/c.py": {"size": 3, "sha256": hashlib.sha256(b"abc").hexdigest()},
+        "/home/u/site/d.py": {"size": 1, "sha256": hashlib.sha256(b"d").hexdigest()},
+    }}))
+    return str(manifest_path)
+
+
+def test_verify_upload(mcp, mocker, manifest, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/site/", "/home/u/site/a.py", "/home/u/site/b.py", "/home/u/site/c.py"]
+    remote = {"/home/u/site/a.py": b"hello", "/home/u/site/b.py": b"w0rld", "/home/u/site/c.py": b"abcd"}
+
+    def response(url, method, **kwargs):
+        content = remote[url[url.index("/home"):]]
+        return fake_response(200, b"" if method == "HEAD" else content, headers={"Content-Length": str(len(content))})
+
+    mock_call_api = mocker.patch("tools.file.call_api", side_effect=response)
+
+    result = mcp.call_tool("verify_upload", {"manifest_path": manifest, "sample": 1})
+
+    mock_files.return_value.tree_get.assert_called_once_with("/home/u/site")
+    # The size is checked first, and only files of the right size are downloaded.
+    assert sorted((c.args[0][c.args[0].index("/home"):], c.args[1]) for c in mock_call_api.call_args_list) == [
+        ("/home/u/site/a.py", "GET"), ("/home/u/site/a.py", "HEAD"),
+        ("/home/u/site/b.py", "GET"), ("/home/u/site/b.py", "HEAD"),
+        ("/home/u/site/c.py", "HEAD"),
+    ]
+    assert result == (
+        f"Verified 4 files from {manifest}: 1 match (1 by SHA-256, 0 by size), 3 missing or mismatched.\n"
+        "/home/u/site/b.py: hash mismatch\n"
+        "/home/u/site/c.py: size mismatch\n"
+        "/home/u/site/d.py: missing"
+    )
+
+
+def test_verify_upload_size_only(mcp, mocker, manifest, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/site/a.py", "/home/u/site/b.py", "/home/u/site/c.py", "/home/u/site/d.py"]
+    sizes = {"/home/u/site/a.py": "5", "/home/u/site/b.py": "5", "/home/u/site/c.py": "4", "/home/u/site/d.py": "1"}
+    response = lambda url, method, **kwargs: fake_response(200, headers={"Content-Length": sizes[url[url.index("/home"):]]})
+    mock_call_api = mocker.patch("tools.file.call_api", side_effect=response)
+
+    result = mcp.call_tool("verify_upload", {"manifest_path": manifest})
+
+    assert {c.args[1] for c in mock_call_api.call_args_list} == {"HEAD"}
+    assert mock_call_api.call_args.kwargs["headers"] == {"Accept-Encoding": "identity"}
+    assert result == (
+        f"Verified 4 files from {manifest}: 3 match (0 by SHA-256, 3 by size), 1 missing or mismatched.\n"
+        "/home/u/site/c.py: size mismatch"
+    )
+
+
+def test_verify_upload_size_only_without_content_length(mcp, mocker, manifest, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.return_value = ["/home/u/site/a.py", "/home/u/site/b.py", "/home/u/site/c.py", "/home/u/site/d.py"]
+    remote = {"/home/u/site/a.py": b"hello", "/home/u/site/b.py": b"w0rld", "/home/u/site/c.py": b"abcd", "/home/u/site/d.py": b"d"}
+    response = lambda url, method, **kwargs: fake_response(200, b"" if method == "HEAD" else remote[url[url.index("/home"):]])
+    mock_call_api = mocker.patch("tools.file.call_api", side_effect=response)
+
+    result = mcp.call_tool("verify_upload", {"manifest_path": manifest, "sample": 0})
+
+    assert sorted(c.args[1] for c in mock_call_api.call_args_list) == ["GET"] * 4 + ["HEAD"] * 4
+    assert result == (
+        f"Verified 4 files from {manifest}: 3 match (0 by SHA-256, 3 by size), 1 missing or mismatched.\n"
+        "/home/u/site/c.py: size mismatch"
+    )
+
+
+def test_verify_upload_directory_removed(mcp, mocker, manifest, fake_response):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.tree_get.side_effect = PythonAnywhereApiException("GET to tree failed, got <Response [404]>")
+    mocker.patch("tools.file.call_api", return_value=fake_response(404))
+
+    result = mcp.call_tool("verify_upload", {"manifest_path": manifest})
+
+    assert result.startswith(f"Verified 4 files from {manifest}: 0 match (0 by SHA-256, 0 by size), 4 missing or mismatched.\n")
+    assert result.count(": missing") == 4
+
+
+def test_verify_upload_empty_manifest(mcp, mocker, tmp_path):
+    file_tools.register_file_tools(mcp)
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps({"files": {}}))
+    result = mcp.call_tool("verify_upload", {"manifest_path": str(manifest_path)})
+    assert result == f"Verified 0 files from {manifest_path}: the manifest lists no files."
+    mock_files.return_value.tree_get.assert_not_called()
+
+
+def test_verify_upload_exception(mcp, mocker, tmp_path):
+    file_tools.register_file_tools(mcp)
+    mocker.patch("tools.file.Files", autospec=True)
+    with pytest.raises(RuntimeError) as exc:
+        mcp.call_tool("verify_upload", {"manifest_path": str(tmp_path / "missing.json")})
+    assert "Failed to verify upload" in str(exc)
+
+
+def test_upload_directory_stops_when_cancelled(mocker, tmp_path):
+    mcp = FastMCP("test")
+    run_sync_tools_in_threads(mcp)
+    file_tools.register_file_tools(mcp)
+    for index in range(40):
+        (tmp_path / f"{index}.txt").write_text("x")
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_files.return_value.path_post.side_effect = lambda path, data: time.sleep(0.02)
+    posts = mock_files.return_value.path_post
+
+    async def cancel_upload():
+        async with create_connected_server_and_client_session(mcp, raise_exceptions=True) as client:
+            async def upload():
+                with pytest.raises(McpError, match="Request cancelled"):
+                    await client.call_tool("upload_directory", {
+                        "local_dir_path": str(tmp_path), "remote_dir_path": "/home/u/site", "max_workers": 2,
+                    })
+
+            async with anyio.create_task_group() as group:
+                group.start_soon(upload)
+                while posts.call_count < 4:
+                    await anyio.sleep(0.01)
+                await client.send_notification(ClientNotification(CancelledNotification(
+                    params=CancelledNotificationParams(requestId=1),
+                )))
+            await anyio.sleep(0.2)
+            return posts.call_count
+
+    after_cancel = anyio.run(cancel_upload)
+    time.sleep(0.2)
+    assert posts.call_count == after_cancel < 10
+
+
+def test_extract_remotely_stops_when_cancelled(mocker):
+    mocker.patch("tools.file.time.sleep")
+    mock_files = mocker.patch("tools.file.Files", autospec=True)
+    mock_schedule = mocker.patch("tools.file.Schedule", autospec=True)
+    mock_schedule.return_value.create.return_value = {"id": 42}
+    cancel = threading.Event()
+    cancel.set()
+    token = current_cancel.set(cancel)
+    try:
+        with pytest.raises(Cancelled):
+            file_tools._extract_remotely("/home/u/site/upload.tar.gz", "/home/u/site")
+    finally:
+        current_cancel.reset(token)
+    mock_files.return_value.path_get.assert_not_called()
+    mock_files.return_value.path_delete.assert_called_once_with("/home/u/site/upload.tar.gz")
+    mock_schedule.return_value.delete.assert_called_once_with(42)
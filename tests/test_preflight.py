@@ -0,0 +1,91 @@
+import socket
+
+import pytest
+import pythonanywhere_core.base
+import requests
+from pythonanywhere_core.base import AuthenticationError
+
+from pythonanywhere_mcp_server import preflight
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch, mocker):
+    monkeypatch.setenv("PYTHONANYWHERE_USERNAME", "alice")
+    monkeypatch.setenv("PYTHONANYWHERE_SITE", "eu.pythonanywhere.com")
+    return mocker.patch("pythonanywhere_mcp_server.preflight.socket.getaddrinfo")
+
+
+def test_check_ok(mocker, fake_response):
+    mock_call_api = mocker.patch("pythonanywhere_mcp_server.preflight.call_api", return_value=fake_response(200))
+    mock_call_api.return_value.ok = True
+    result = preflight.check()
+    mock_call_api.assert_called_once_with("https://eu.pythonanywhere.com/api/v0/user/alice/cpu/", "GET")
+    assert result["state"] == "ok"
+    assert result["site"] == "eu.pythonanywhere.com"
+    assert {"dns_ms", "api_ms", "checked_at"} <= set(result)
+    assert preflight.status() == result
+
+
+def test_check_bad_token(mocker, capsys):
+    mocker.patch("pythonanywhere_mcp_server.preflight.call_api", side_effect=AuthenticationError("401"))
+    result = preflight.check()
+    assert result["state"] == "failed"
+    assert result["error"] == "API token rejected by eu.pythonanywhere.com; check API_TOKEN and PYTHONANYWHERE_SITE."
+    assert "Preflight check failed: API token rejected" in capsys.readouterr().err
+
+
+def test_check_wrong_username(mocker, fake_response):
+    response = fake_response(404)
+    response.ok = False
+    mocker.patch("pythonanywhere_mcp_server.preflight.call_api", return_value=response)
+    result = preflight.check()
+    assert result["error"].startswith("API returned HTTP 404 for user 'alice' on eu.pythonanywhere.com")
+
+
+def test_check_unresolvable_site(mocker, environment):
+    environment.side_effect = socket.gaierror("Name or service not known")
+    mock_call_api = mocker.patch("pythonanywhere_mcp_server.preflight.call_api")
+    result = preflight.check()
+    assert result["error"].startswith("Cannot resolve eu.pythonanywhere.com")
+    mock_call_api.assert_not_called()
+
+
+def test_start_runs_check_in_background(mocker):
+    mock_check = mocker.patch("pythonanywhere_mcp_server.preflight.check")
+    preflight.start().join()
+    mock_check.assert_called_once_with()
+
+
+def test_use_shared_session(monkeypatch, mocker):
+    monkeypatch.setattr(pythonanywhere_core.base, "requests", pythonanywhere_core.base.requests)
+    mock_request = mocker.patch("pythonanywhere_mcp_server.preflight.requests.Session.request")
+    session = preflight.use_shared_session(pool_size=3)
+    pythonanywhere_core.base.requests.request(method="GET", url="https://eu.pythonanywhere.com/api/v0/user/alice/cpu/")
+    mock_request.assert_called_once_with("GET", "https://eu.pythonanywhere.com/api/v0/user/alice/cpu/", timeout=60.0)
+    assert session.get_adapter("https://www.pythonanywhere.com")._pool_maxsize == 3
+
+
+def test_call_api_through_shared_session(monkeypatch, mocker):
+    monkeypatch.setattr(pythonanywhere_core.base, "requests", pythonanywhere_core.base.requests)
+    monkeypatch.setenv("API_TOKEN", "secret")
+    sent = []
+
+    def send(request, **kwargs):
+        sent.append((request, kwargs))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"daily_cpu_limit_seconds": 2000}'
+        response.request = request
+        return response
+
+    mocker.patch("pythonanywhere_mcp_server.preflight.HTTPAdapter.send", side_effect=send)
+    preflight.use_shared_session()
+
+    response = pythonanywhere_core.base.call_api("https://eu.pythonanywhere.com/api/v0/user/alice/cpu/", "GET")
+
+    assert response.json() == {"daily_cpu_limit_seconds": 2000}
+    request, kwargs = sent[0]
+    assert request.headers["Authorization"] == "Token secret"
+    assert kwargs["timeout"] == 60.0
+    assert pythonanywhere_core.base.requests.Response is requests.Response
+    assert requests.request is not pythonanywhere_core.base.requests.request
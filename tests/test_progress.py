@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import anyio
+import pytest
+from mcp.server.fastmcp import Context, FastMCP
+
+from pythonanywhere_mcp_server.concurrency import iter_concurrently, run_concurrently
+from pythonanywhere_mcp_server.progress import Cancelled, Progress, cancelled, current_cancel
+from pythonanywhere_mcp_server.server import run_sync_tools_in_threads
+
+
+def context(progress_token="token"):
+    sent = []
+
+    async def report_progress(progress, total=None, message=None):
+        sent.append((progress, total, message))
+
+    meta = SimpleNamespace(progressToken=progress_token)
+    return SimpleNamespace(request_context=SimpleNamespace(meta=meta), report_progress=report_progress), sent
+
+
+def report_in_thread(progress, *reports):
+    async def run():
+        for args, kwargs in reports:
+            await anyio.to_thread.run_sync(lambda: progress.report(*args, **kwargs))
+    anyio.run(run)
+
+
+def test_report_throttles_unless_forced(mocker):
+    clock = mocker.patch("pythonanywhere_mcp_server.progress.time")
+    clock.monotonic.side_effect = [0.0, 0.1, 0.6, 0.7]
+    ctx, sent = context()
+    report_in_thread(
+        Progress(ctx),
+        ((1,), {"message": "one"}),
+        ((2,), {"message": "two"}),
+        ((3,), {"message": "three"}),
+        ((4, 4), {"message": "done", "force": True}),
+    )
+    assert sent == [(1, None, "one"), (3, None, "three"), (4, 4, "done")]
+
+
+@pytest.mark.parametrize("ctx", [None, context(progress_token=None)[0]])
+def test_report_without_progress_token(ctx):
+    progress = Progress(ctx)
+    assert not progress.enabled
+    progress.report(1, message="ignored")
+
+
+def test_progress_outside_a_request():
+    mcp = FastMCP("test")
+    run_sync_tools_in_threads(mcp)
+
+    @mcp.tool()
+    def work(ctx: Context | None = None) -> str:
+        progress = Progress(ctx)
+        progress.report(1, force=True)
+        return f"enabled: {progress.enabled}"
+
+    assert asyncio.run(mcp.call_tool("work", {}))[1] == {"result": "enabled: False"}
+
+
+def test_report_after_cancellation():
+    ctx, sent = context()
+    progress = Progress(ctx)
+    cancel = threading.Event()
+    cancel.set()
+    token = current_cancel.set(cancel)
+    try:
+        assert cancelled()
+        progress.report(1, force=True)
+    finally:
+        current_cancel.reset(token)
+    assert not cancelled()
+    assert sent == []
+
+
+def test_run_concurrently_reports_progress(mocker):
+    progress = mocker.Mock(spec=Progress)
+    outcomes = run_concurrently(lambda item: item * 2, [1, 2, 3], 2, progress, "Doubled {done} of {total}")
+    assert outcomes == {1: 2, 2: 4, 3: 6}
+    assert [c.args for c in progress.report.call_args_list] == [
+        (1, 3, "Doubled 1 of 3"), (2, 3, "Doubled 2 of 3"), (3, 3, "Doubled 3 of 3"),
+    ]
+    assert progress.report.call_args.kwargs == {"force": True}
+
+
+def test_iter_concurrently_stops_when_cancelled():
+    cancel = threading.Event()
+    taken = []
+
+    def items():
+        for item in range(100):
+            taken.append(item)
+            yield item
+
+    def work(item):
+        if item == 3:
+            cancel.set()
+
+    token = current_cancel.set(cancel)
+    try:
+        with pytest.raises(Cancelled):
+            for _ in iter_concurrently(work, items(), max_workers=2):
+                pass
+    finally:
+        current_cancel.reset(token)
+    assert len(taken) < 10
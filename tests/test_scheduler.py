@@ -0,0 +1,88 @@
+import contextlib
+import threading
+import time
+
+import pytest
+
+from pythonanywhere_mcp_server.scheduler import Priority, Scheduler, current_flow
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def queue_call(scheduler, priority, order, label, flow="default"):
+    def run():
+        current_flow.set(flow)
+        scheduler.call(priority, order.append, label)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_call_returns_result():
+    assert Scheduler().call(Priority.INTERACTIVE, lambda a, b=0: a + b, 1, b=2) == 3
+
+
+def test_higher_priority_goes_first():
+    scheduler = Scheduler(max_concurrent=1)
+    order = []
+    with scheduler.slot(Priority.BULK):
+        threads = [queue_call(scheduler, Priority.BULK, order, "bulk")]
+        wait_until(lambda: scheduler.stats()["bulk"]["queued"] == 1)
+        threads.append(queue_call(scheduler, Priority.MUTATION, order, "mutation"))
+        threads.append(queue_call(scheduler, Priority.INTERACTIVE, order, "interactive"))
+        wait_until(lambda: scheduler.stats()["interactive"]["queued"] == 1 and scheduler.stats()["mutation"]["queued"] == 1)
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "mutation", "bulk"]
+
+
+def test_class_limit_leaves_room_for_other_classes():
+    scheduler = Scheduler(limits={Priority.BULK: 1}, max_concurrent=2)
+    order = []
+    with scheduler.slot(Priority.BULK):
+        bulk = queue_call(scheduler, Priority.BULK, order, "bulk")
+        wait_until(lambda: scheduler.stats()["bulk"]["queued"] == 1)
+        queue_call(scheduler, Priority.INTERACTIVE, order, "interactive").join()
+        assert order == ["interactive"]
+    bulk.join()
+    assert order == ["interactive", "bulk"]
+
+
+def test_flows_take_turns_within_a_class():
+    scheduler = Scheduler(max_concurrent=1)
+    order = []
+    threads = []
+    with scheduler.slot(Priority.BULK):
+        for index, flow in enumerate(["a", "a", "a", "b"]):
+            threads.append(queue_call(scheduler, Priority.BULK, order, f"{flow}{index}", flow))
+            wait_until(lambda: scheduler.stats()["bulk"]["queued"] == index + 1)
+    for thread in threads:
+        thread.join()
+    assert order == ["a0", "b3", "a1", "a2"]
+
+
+def test_stats():
+    scheduler = Scheduler()
+    scheduler.call(Priority.MUTATION, time.sleep, 0)
+    with pytest.raises(ZeroDivisionError):
+        scheduler.call(Priority.MUTATION, lambda: 1 / 0)
+    stats = scheduler.stats()
+    assert stats["mutation"]["completed"] == 2
+    assert stats["mutation"]["running"] == 0
+    assert stats["mutation"]["queued"] == 0
+    assert stats["max_concurrent"] == 16
+
+
+def test_interactive_calls_are_admitted_while_other_classes_are_full():
+    scheduler = Scheduler()
+    with contextlib.ExitStack() as stack:
+        for priority in (Priority.MUTATION, Priority.BULK):
+            for _ in range(scheduler.limits[priority]):
+                stack.enter_context(scheduler.slot(priority))
+        assert scheduler.call(Priority.INTERACTIVE, lambda: "read") == "read"
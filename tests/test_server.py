@@ -1,12 +1,22 @@
+import asyncio
+import threading
+
+import anyio
 import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
 
 from pythonanywhere_mcp_server import server
+from pythonanywhere_mcp_server.concurrency import run_concurrently
+from pythonanywhere_mcp_server.scheduler import current_flow
 
 
 @pytest.fixture()
 def mock_FastMCP(mocker):
     """Mock the FastMCP class to avoid actual server creation."""
-    return mocker.patch("pythonanywhere_mcp_server.server.FastMCP", autospec=True)
+    mock = mocker.patch("pythonanywhere_mcp_server.server.FastMCP", autospec=True)
+    mock.return_value._mcp_server = mocker.MagicMock()
+    return mock
 
 
 def test_create_server(monkeypatch, mock_FastMCP):
@@ -21,6 +31,10 @@ def test_create_server(monkeypatch, mock_FastMCP):
         "register_webapp_tools",
         "register_website_tools",
         "register_schedule_tools",
+        "register_file_resources",
+        "register_metrics_resources",
+        "register_health_resources",
+        "apply_response_budget",
     ]
 )
 def test_register_tools(monkeypatch, mocker, mock_FastMCP, register_fn):
@@ -38,3 +52,47 @@ def test_missing_api_token(monkeypatch):
     with pytest.raises(RuntimeError) as excinfo:
         server.create_server()
     assert "API_TOKEN environment variable must be set" in str(excinfo.value)
+
+
+def test_run_sync_tools_in_threads():
+    mcp = FastMCP("test")
+    server.run_sync_tools_in_threads(mcp)
+
+    @mcp.tool()
+    def whereami(name: str) -> str:
+        """Return the thread the tool ran on."""
+        return f"{name} on {threading.current_thread() is threading.main_thread()}"
+
+    async def call():
+        tools = await mcp.list_tools()
+        result = await mcp.call_tool("whereami", {"name": "tool"})
+        return tools, result
+
+    tools, result = asyncio.run(call())
+    assert tools[0].name == "whereami"
+    assert tools[0].description == "Return the thread the tool ran on."
+    assert result[1] == {"result": "tool on False"}
+    assert whereami("direct") == "direct on True"
+
+
+def test_run_sync_tools_in_threads_uses_a_flow_per_session():
+    mcp = FastMCP("test")
+    server.run_sync_tools_in_threads(mcp)
+
+    @mcp.tool()
+    def flows() -> list[str]:
+        """Return the scheduler flow of the call and of a batch it starts."""
+        return [current_flow.get(), *run_concurrently(lambda item: current_flow.get(), [0]).values()]
+
+    async def call_from_two_sessions():
+        async with (
+            create_connected_server_and_client_session(mcp) as first,
+            create_connected_server_and_client_session(mcp) as second,
+        ):
+            return [(await client.call_tool("flows", {})).structuredContent["result"] for client in (first, first, second)]
+
+    first, again, second = anyio.run(call_from_two_sessions)
+    assert first[0] == again[0]
+    assert first[0].startswith("session-")
+    assert first[1].startswith(f"{first[0]}/batch-")
+    assert second[0] != first[0]
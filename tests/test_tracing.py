@@ -0,0 +1,133 @@
+import asyncio
+import json
+import pstats
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from pythonanywhere_mcp_server.server import run_sync_tools_in_threads
+from pythonanywhere_mcp_server.tool_hooks import wrap_tools
+from pythonanywhere_mcp_server.tracing import Tracer, traced_request
+
+URL = "https://www.pythonanywhere.com/api/v0/user/alice/files/path/home/alice/a.txt"
+
+
+@pytest.fixture
+def traced_server(tmp_path):
+    def make(**options):
+        tracer = Tracer(str(tmp_path / "trace.jsonl"), **options)
+        mcp = FastMCP("test")
+        wrap_tools(mcp, tracer.trace_tool)
+        run_sync_tools_in_threads(mcp)
+        wrap_tools(mcp, tracer.trace_run)
+        return tracer, mcp
+    return make
+
+
+def spans(tracer):
+    return [json.loads(line) for line in tracer.path.read_text().splitlines()]
+
+
+def test_trace_tool_call(mocker, traced_server, fake_response):
+    tracer, mcp = traced_server()
+    request = traced_request(mocker.Mock(return_value=fake_response(200, headers={"Content-Length": "5"})))
+
+    @mcp.tool()
+    def fetch(path: str) -> str:
+        request("GET", URL)
+        request("POST", URL, files={"content": b"abc"})
+        return "hello"
+
+    asyncio.run(mcp.call_tool("fetch", {"path": "/home/alice/a.txt"}))
+    asyncio.run(mcp.call_tool("fetch", {"path": "/home/alice/a.txt"}))
+
+    first = spans(tracer)[:6]
+    root = first[0]
+    assert root["name"] == "tool"
+    assert root["parent_id"] is None
+    assert root["attributes"] | {"arguments_sha256": None} == {
+        "tool": "fetch", "arguments_sha256": None, "result_bytes": 7, "upstream_requests": 2, "error": None,
+    }
+    assert [span["name"] for span in first[1:]] == ["queue", "run", "http", "http", "encode"]
+    assert {span["trace_id"] for span in first} == {root["trace_id"]}
+    assert {span["parent_id"] for span in first[1:]} == {root["span_id"]}
+    assert first[3]["attributes"] == {
+        "method": "GET", "path": "/api/v0/user/alice/files/path/home/alice/a.txt",
+        "status": 200, "request_bytes": None, "response_bytes": 5,
+    }
+    assert first[4]["attributes"]["request_bytes"] == 3
+
+    second = spans(tracer)[6]
+    assert second["trace_id"] != root["trace_id"]
+    assert second["attributes"]["arguments_sha256"] == root["attributes"]["arguments_sha256"]
+
+
+def test_trace_failed_tool_call(traced_server):
+    tracer, mcp = traced_server()
+
+    @mcp.tool()
+    def broken() -> str:
+        raise RuntimeError("no such file")
+
+    with pytest.raises(Exception, match="no such file"):
+        asyncio.run(mcp.call_tool("broken", {}))
+    root = spans(tracer)[0]
+    assert root["attributes"]["error"] == "RuntimeError: no such file"
+    assert [span["name"] for span in spans(tracer)[1:]] == ["queue", "run"]
+
+
+def test_trace_cancelled_tool_call(traced_server):
+    tracer, mcp = traced_server()
+
+    @mcp.tool()
+    async def wait() -> str:
+        await asyncio.sleep(10)
+        return "done"
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(asyncio.wait_for(mcp.call_tool("wait", {}), 0.05))
+    root = spans(tracer)[0]
+    assert root["name"] == "tool"
+    assert root["attributes"]["error"] == "cancelled"
+    assert root["attributes"]["result_bytes"] is None
+
+
+def test_requests_outside_tool_calls_are_not_traced(mocker, fake_response):
+    request = mocker.Mock(return_value=fake_response(200))
+    assert traced_request(request)("GET", URL, timeout=3).status_code == 200
+    request.assert_called_once_with("GET", URL, timeout=3)
+
+
+def test_profile_slow_calls(traced_server):
+    tracer, mcp = traced_server(profile_slow=0)
+
+    @mcp.tool()
+    def slow() -> str:
+        return "done"
+
+    asyncio.run(mcp.call_tool("slow", {}))
+    profile = spans(tracer)[0]["attributes"]["profile"]
+    assert profile.startswith(str(tracer.profile_dir))
+    assert pstats.Stats(profile).total_calls > 0
+
+
+def test_fast_calls_are_not_profiled(traced_server):
+    tracer, mcp = traced_server(profile_slow=60)
+
+    @mcp.tool()
+    def fast() -> str:
+        return "done"
+
+    asyncio.run(mcp.call_tool("fast", {}))
+    assert "profile" not in spans(tracer)[0]["attributes"]
+    assert not tracer.profile_dir.exists()
+
+
+def test_tracer_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("PYTHONANYWHERE_TRACE", raising=False)
+    assert Tracer.from_environment() is None
+    monkeypatch.setenv("PYTHONANYWHERE_TRACE", str(tmp_path / "trace.jsonl"))
+    monkeypatch.setenv("PYTHONANYWHERE_PROFILE_SLOW", "2.5")
+    monkeypatch.setenv("PYTHONANYWHERE_PROFILE_SAMPLE", "0.1")
+    tracer = Tracer.from_environment()
+    assert (tracer.path, tracer.profile_slow, tracer.profile_sample) == (tmp_path / "trace.jsonl", 2.5, 0.1)
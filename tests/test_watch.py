@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from pythonanywhere_mcp_server import watch as watch_module
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('hi')")
+    (tmp_path / "app" / "__pycache__").mkdir()
+    (tmp_path / "app" / "__pycache__" / "main.cpython-313.pyc").write_bytes(b"\x00")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref")
+    (tmp_path / "README.md").write_text("readme")
+    return tmp_path
+
+
+def test_snapshot_skips_ignored_entries(project):
+    assert sorted(watch_module.snapshot(str(project))) == ["README.md", "app/main.py"]
+
+
+def test_diff():
+    old = {"a.py": (1, 1), "b.py": (1, 1), "c.py": (1, 1)}
+    new = {"a.py": (1, 1), "b.py": (2, 1), "d.py": (1, 1)}
+    assert watch_module.diff(old, new) == (["b.py", "d.py"], ["c.py"])
+
+
+def test_push(project, mocker):
+    mock_files = mocker.patch("pythonanywhere_mcp_server.watch.Files", autospec=True)
+    mock_files.return_value.path_post.return_value = 200
+    mock_files.return_value.path_delete.return_value = 204
+    outcomes = watch_module.push(str(project), "/home/u/site/", ["app/main.py"], ["old.py"])
+    mock_files.return_value.path_post.assert_called_once_with("/home/u/site/app/main.py", b"print('hi')")
+    mock_files.return_value.path_delete.assert_called_once_with("/home/u/site/old.py")
+    assert outcomes == {"/home/u/site/app/main.py": 200, "/home/u/site/old.py": 204}
+
+
+@pytest.mark.parametrize("website,expected", [
+    (False, "Webapp 'u.pythonanywhere.com' reloaded."),
+    (True, "Website 'u.pythonanywhere.com' reloaded."),
+])
+def test_reload(mocker, website, expected):
+    mock_webapp = mocker.patch("pythonanywhere_mcp_server.watch.Webapp", autospec=True)
+    mock_website = mocker.patch("pythonanywhere_mcp_server.watch.Website", autospec=True)
+    assert watch_module.reload("u.pythonanywhere.com", website) == expected
+    assert mock_website.return_value.reload.called is website
+    assert mock_webapp.return_value.reload.called is not website
+
+
+def test_watch_pushes_burst_once_and_reloads(project, mocker):
+    mock_push = mocker.patch("pythonanywhere_mcp_server.watch.push", return_value={"/r/app/main.py": 200, "/r/new.py": 201})
+    mock_reload = mocker.patch("pythonanywhere_mcp_server.watch.reload", return_value="Webapp 'd' reloaded.")
+    edits = iter([
+        lambda: (project / "app" / "main.py").write_text("print('bye')"),
+        lambda: (project / "new.py").write_text("x = 1"),
+    ])
+
+    def sleep(seconds):
+        edit = next(edits, None)
+        if edit:
+            edit()
+            os.utime(project / "app" / "main.py", ns=(1, 1))
+
+    mocker.patch("pythonanywhere_mcp_server.watch.time.sleep", side_effect=sleep)
+    logs = []
+    watch_module.watch(str(project), "/r", domain="d", debounce=0, iterations=5, log=logs.append)
+
+    mock_push.assert_called_once_with(str(project), "/r", ["app/main.py", "new.py"], [], watch_module.MAX_WORKERS)
+    mock_reload.assert_called_once_with("d", False)
+    assert logs[-1].startswith("Pushed 2 changed and 0 removed files; Webapp 'd' reloaded. in ")
+
+
+def test_watch_retries_failed_files_and_skips_reload(project, mocker):
+    mock_push = mocker.patch("pythonanywhere_mcp_server.watch.push", side_effect=[
+        {"/r/README.md": Exception("boom")},
+        {"/r/README.md": 200, "/r/app/main.py": 200},
+    ])
+    mock_reload = mocker.patch("pythonanywhere_mcp_server.watch.reload")
+    edits = iter([
+        lambda: (project / "README.md").write_text("changed"),
+        None,
+        lambda: (project / "app" / "main.py").write_text("touched"),
+    ])
+    mocker.patch("pythonanywhere_mcp_server.watch.time.sleep", side_effect=lambda seconds: (next(edits, None) or (lambda: None))())
+    logs = []
+    watch_module.watch(str(project), "/r", domain="d", debounce=0, iterations=5, log=logs.append)
+
+    assert "Failed to push /r/README.md: boom" in logs
+    assert [c.args[2] for c in mock_push.call_args_list] == [["README.md"], ["README.md", "app/main.py"]]
+    mock_reload.assert_called_once_with("d", False)
+
+
+def test_watch_requires_directory(tmp_path):
+    with pytest.raises(ValueError):
+        watch_module.watch(str(tmp_path / "missing"), "/r", iterations=0)